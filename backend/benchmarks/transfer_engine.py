@@ -0,0 +1,387 @@
+"""
+End-to-end throughput benchmark for the copy worker.
+
+Generates synthetic media trees in a temporary directory and runs each one
+through CopyWorker as a real copy job (manifest walk, journal, progress
+registry, parallel streams, optional verification) against a throwaway
+database. Reads can be slowed down to mimic a FUSE mount (rclone/Zurg):
+the wrapper adds a fixed latency per read call and optionally caps the
+source bandwidth, and the source is treated as FUSE so the readahead path
+runs as it would in production.
+
+Scenarios:
+    large_file   one big remux
+    small_files  many small files (subtitles, artwork, metadata)
+    season_pack  a season folder: episodes plus a subtitle and .nfo each
+
+Every scenario runs once per transfer backend (--backends, default all of
+fast_copy.TRANSFER_BACKENDS) so the backends can be compared side by side.
+
+Prints machine-readable JSON (MB/s, data-path syscalls, /proc/self/io
+counters, peak RSS and progress-callback overhead per run); worker logging
+goes to stderr.
+
+Usage (from backend/):
+    python benchmarks/transfer_engine.py --runs 3
+    python benchmarks/transfer_engine.py --scenarios season_pack --latency-ms 20 --source-mb-per-sec 80
+    python benchmarks/transfer_engine.py --backends blocking pipelined mmap
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MB = 1024 * 1024
+SCENARIOS = ("large_file", "small_files", "season_pack")
+
+
+def default_workdir() -> str:
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+# --- Synthetic trees ---------------------------------------------------------
+
+def write_file(path: str, size_bytes: int, block: bytes):
+    with open(path, 'wb') as f:
+        remaining = size_bytes
+        while remaining > 0:
+            f.write(block[:min(remaining, len(block))])
+            remaining -= len(block)
+
+
+def make_tree(scenario: str, root: str, args) -> str:
+    """Create the source for a scenario under `root`; returns the job's source path."""
+    block = os.urandom(MB)
+    if scenario == "large_file":
+        path = os.path.join(root, "Movie (2024) 2160p REMUX.mkv")
+        write_file(path, args.large_mb * MB, block)
+        return path
+
+    if scenario == "small_files":
+        path = os.path.join(root, "Extras")
+        for i in range(args.small_count):
+            folder = os.path.join(path, f"disc{i // 250:02d}")
+            os.makedirs(folder, exist_ok=True)
+            write_file(os.path.join(folder, f"item{i:05d}.bin"), args.small_kb * 1024, block)
+        return path
+
+    path = os.path.join(root, "Show (2024)", "Season 01")
+    os.makedirs(path)
+    for i in range(1, args.episodes + 1):
+        name = f"Show.S01E{i:02d}.1080p.WEB-DL"
+        write_file(os.path.join(path, f"{name}.mkv"), args.episode_mb * MB, block)
+        write_file(os.path.join(path, f"{name}.en.srt"), 60 * 1024, block)
+        write_file(os.path.join(path, f"{name}.nfo"), 4 * 1024, block)
+    return os.path.dirname(path)
+
+
+def tree_stats(path: str):
+    if os.path.isfile(path):
+        return 1, os.path.getsize(path)
+    files = total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            files += 1
+            total += os.path.getsize(os.path.join(dirpath, name))
+    return files, total
+
+
+# --- Instrumentation ---------------------------------------------------------
+
+class SlowReadOS:
+    """
+    Stands in for the `os` module inside fast_copy. Counts the data-path
+    syscalls and, when configured, sleeps after every read like a FUSE
+    round trip: `latency` seconds per call plus the time the bytes would take
+    at `bandwidth` bytes/sec.
+    """
+
+    READ_CALLS = ("read", "readv", "preadv", "pread", "copy_file_range", "sendfile")
+    COUNTED_CALLS = READ_CALLS + ("write", "lseek", "fstat")
+
+    def __init__(self, real_os, latency: float = 0.0, bandwidth: float = 0.0):
+        self._os = real_os
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._wrapped = {}
+
+    def reset(self):
+        with self._lock:
+            self.calls = Counter()
+
+    def __getattr__(self, name):
+        attr = getattr(self._os, name)
+        if name not in self.COUNTED_CALLS or not callable(attr):
+            return attr
+        if name not in self._wrapped:
+            self._wrapped[name] = self._wrap(name, attr)
+        return self._wrapped[name]
+
+    def _wrap(self, name, func):
+        is_read = name in self.READ_CALLS
+
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            with self._lock:
+                self.calls[name] += 1
+            if is_read and (self.latency or self.bandwidth):
+                nbytes = result if isinstance(result, int) else len(result)
+                delay = self.latency + (nbytes / self.bandwidth if self.bandwidth else 0)
+                if delay > 0:
+                    time.sleep(delay)
+            return result
+        return wrapper
+
+
+class RssSampler:
+    """Samples VmRSS from /proc in a background thread to find a run's peak."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.start_kb = self.peak_kb = self._rss_kb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _rss_kb():
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:
+            return 0
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_kb = max(self.peak_kb, self._rss_kb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_kb = max(self.peak_kb, self._rss_kb())
+
+
+def proc_io():
+    """Process-wide I/O counters (syscr/syscw are read/write syscall counts), if available."""
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except (OSError, ValueError):
+        return None
+
+
+class CallbackTimer:
+    """Wraps CopyWorker._copy_file_with_progress to time the progress callback."""
+
+    def __init__(self, worker_class):
+        self.calls = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+        original = worker_class._copy_file_with_progress
+        timer = self
+
+        def timed(worker, src, dst, callback, *args, **kwargs):
+            def timed_callback(*cb_args):
+                started = time.perf_counter()
+                try:
+                    return callback(*cb_args)
+                finally:
+                    elapsed = time.perf_counter() - started
+                    with timer._lock:
+                        timer.calls += 1
+                        timer.seconds += elapsed
+            return original(worker, src, dst, timed_callback, *args, **kwargs)
+
+        worker_class._copy_file_with_progress = timed
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.seconds = 0.0
+
+
+# --- Runner ------------------------------------------------------------------
+
+def configure(db, SystemSettings, args):
+    settings = {
+        "copy_streams_per_job": str(args.streams),
+        "copy_verify_checksums": "true" if args.verify else "false",
+        "copy_link_mode": "off",      # Measure the data path, not hard links on the same tmpfs
+        "copy_space_policy": "off",
+    }
+    for key, value in settings.items():
+        db.merge(SystemSettings(key=key, value=value, is_encrypted=False))
+    db.commit()
+
+
+def run_once(worker, db, CopyJob, source: str, destination: str, backend: str, slow_os, timer):
+    job = CopyJob(source_path=source, destination_path=destination, status="queued", progress_percent=0,
+                  transfer_backend=backend)
+    db.add(job)
+    db.commit()
+
+    slow_os.reset()
+    timer.reset()
+    io_before = proc_io()
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        worker._run_job(job.id)
+        elapsed = time.perf_counter() - started
+    io_after = proc_io()
+
+    db.expire_all()
+    job = db.get(CopyJob, job.id)
+    files, copied = tree_stats(destination) if os.path.exists(destination) else (0, 0)
+    result = {
+        "status": job.status,
+        "error": job.error_message,
+        "seconds": round(elapsed, 4),
+        "mb_per_sec": round(copied / elapsed / MB, 2) if elapsed > 0 else None,
+        "files_per_sec": round(files / elapsed, 1) if elapsed > 0 else None,
+        "copy_method": job.copy_method,
+        "data_syscalls": dict(slow_os.calls),
+        "proc_io": {k: io_after[k] - io_before[k] for k in io_after} if io_before and io_after else None,
+        "peak_rss_mb": round(rss.peak_kb / 1024, 1),
+        "peak_rss_delta_mb": round((rss.peak_kb - rss.start_kb) / 1024, 1),
+        "progress_callback": {
+            "calls": timer.calls,
+            "seconds": round(timer.seconds, 4),
+            "percent_of_wall": round(timer.seconds / elapsed * 100, 2) if elapsed > 0 else None,
+            "us_per_call": round(timer.seconds / timer.calls * 1e6, 2) if timer.calls else None,
+        },
+    }
+    if os.path.isdir(destination):
+        shutil.rmtree(destination)
+    elif os.path.exists(destination):
+        os.remove(destination)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--backends", nargs="+", help="Transfer backends to compare (default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per scenario (best is reported too)")
+    parser.add_argument("--dir", default=default_workdir(), help="Working directory (default: tmpfs)")
+    parser.add_argument("--streams", type=int, default=4, help="copy_streams_per_job")
+    parser.add_argument("--verify", action="store_true", help="Enable copy_verify_checksums")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per source read (FUSE-like)")
+    parser.add_argument("--source-mb-per-sec", type=float, default=0.0, help="Simulated source bandwidth (0 = unlimited)")
+    parser.add_argument("--large-mb", type=int, default=512, help="large_file: size in MB")
+    parser.add_argument("--small-count", type=int, default=2000, help="small_files: number of files")
+    parser.add_argument("--small-kb", type=int, default=32, help="small_files: size of each file in KB")
+    parser.add_argument("--episodes", type=int, default=8, help="season_pack: number of episodes")
+    parser.add_argument("--episode-mb", type=int, default=128, help="season_pack: size of each episode in MB")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="copycat-bench-", dir=args.dir)
+    # The worker's database and journals live in the scratch directory too
+    os.environ["DATABASE_DIR"] = os.path.join(workdir, "data")
+    os.makedirs(os.environ["DATABASE_DIR"])
+
+    import fast_copy
+    backends = args.backends or list(fast_copy.TRANSFER_BACKENDS)
+    unknown = [b for b in backends if b not in fast_copy.TRANSFER_BACKENDS]
+    if unknown:
+        parser.error(f"unknown backend(s) {unknown}, choose from {list(fast_copy.TRANSFER_BACKENDS)}")
+    from checksum import HASH_ALGORITHM
+    from copy_worker import CopyWorker, copy_worker
+    from database import SessionLocal, engine
+    from models import Base, CopyJob, SystemSettings
+
+    Base.metadata.create_all(bind=engine)
+    slow_os = SlowReadOS(os, args.latency_ms / 1000, args.source_mb_per_sec * MB)
+    fast_copy.os = slow_os
+    source_root = os.path.join(workdir, "source")
+    if args.latency_ms or args.source_mb_per_sec:
+        # Behave as if the source were an rclone/Zurg mount
+        real_is_fuse = fast_copy.is_fuse_path
+        fast_copy.is_fuse_path = lambda path: path.startswith(source_root) or real_is_fuse(path)
+    timer = CallbackTimer(CopyWorker)
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "workdir": workdir,
+            "streams": args.streams,
+            "verify": args.verify,
+            "hash_algorithm": HASH_ALGORITHM if args.verify else None,
+            "latency_ms": args.latency_ms,
+            "source_mb_per_sec": args.source_mb_per_sec,
+        },
+        "scenarios": [],
+    }
+
+    db = SessionLocal()
+    try:
+        configure(db, SystemSettings, args)
+        for scenario in args.scenarios:
+            scenario_root = os.path.join(source_root, scenario)
+            os.makedirs(scenario_root)
+            print(f"Generating {scenario}...", file=sys.stderr)
+            source = make_tree(scenario, scenario_root, args)
+            files, total = tree_stats(source)
+            destination = os.path.join(workdir, "destination", scenario, os.path.basename(source))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+            results = {}
+            for backend in backends:
+                runs = []
+                for run in range(args.runs):
+                    print(f"  {scenario} / {backend} run {run + 1}/{args.runs}", file=sys.stderr)
+                    with redirect_stdout(sys.stderr):
+                        runs.append(run_once(copy_worker, db, CopyJob, source, destination, backend, slow_os, timer))
+                completed = [r for r in runs if r["status"] == "completed"]
+                results[backend] = {
+                    "runs": runs,
+                    "best": min(completed, key=lambda r: r["seconds"]) if completed else None,
+                }
+            report["scenarios"].append({
+                "scenario": scenario,
+                "files": files,
+                "bytes": total,
+                "backends": results,
+                "fastest_backend": min(
+                    (b for b in results if results[b]["best"]), key=lambda b: results[b]["best"]["seconds"], default=None
+                ),
+            })
+            shutil.rmtree(scenario_root)
+    finally:
+        db.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
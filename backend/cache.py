@@ -1,47 +1,245 @@
 """
 Backend caching for directory listings to improve performance with slow FUSE mounts.
+
+Entries younger than the TTL are fresh. Older entries are still served
+(stale-while-revalidate) for up to `stale_seconds` more while a background
+thread re-reads the directory, so only the very first visit to a folder
+waits on the mount. A listing that is invalidated while it is being read
+isn't cached when the read finishes, it may predate the change.
+
+The cache is a bounded LRU: it holds at most `max_entries` listings and
+roughly `max_bytes` of listing data, evicting the least recently used
+entries first. A sweeper thread drops entries too old to be served.
 """
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set
 from datetime import datetime, timedelta
+import os
 import threading
+import time
+
+DEFAULT_MAX_ENTRIES = int(os.getenv("BROWSE_CACHE_MAX_ENTRIES", "2000"))
+DEFAULT_MAX_MB = float(os.getenv("BROWSE_CACHE_MAX_MB", "256"))
+SWEEP_INTERVAL = 60  # Seconds between expiry sweeps
+
+ENTRY_OVERHEAD_BYTES = 400  # Key, timestamp and bookkeeping per cached listing
+
+
+def approximate_size(data) -> int:
+    """Rough in-memory size of a cached listing in bytes."""
+    measure = getattr(data, "approximate_size", None)
+    return ENTRY_OVERHEAD_BYTES + (measure() if measure else 0)
+
 
 class DirectoryCache:
-    def __init__(self, ttl_seconds: int = 300):  # 5 minutes default
-        self._cache: Dict[str, tuple[Dict, datetime]] = {}
+    def __init__(self, ttl_seconds: int = 300, stale_seconds: int = 3600,  # 5 minutes fresh, 1 hour stale
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = int(DEFAULT_MAX_MB * 1024 * 1024)):
+        self._cache: "OrderedDict[str, tuple[Any, datetime, int]]" = OrderedDict()  # LRU order, newest last
         self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._generation = 0  # Bumped by every invalidation
+        self._loading: Dict[str, int] = {}  # key -> loads in flight
+        self._invalidated: Dict[str, int] = {}  # key -> generation it was invalidated at, while loading
+        self._cleared_at = 0
+        self._sweeper: Optional[threading.Thread] = None
         self.ttl = timedelta(seconds=ttl_seconds)
+        self.stale_ttl = timedelta(seconds=stale_seconds)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.refresh_failures = 0
+        self.discarded_loads = 0
     
-    def get(self, key: str) -> Optional[Dict]:
+    def get(self, key: str) -> Optional[Any]:
         """Get cached directory listing if not expired."""
         with self._lock:
             if key in self._cache:
-                data, timestamp = self._cache[key]
-                if datetime.now() - timestamp < self.ttl:
+                data, timestamp, _ = self._cache[key]
+                age = datetime.now() - timestamp
+                if age < self.ttl:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
                     return data
-                else:
-                    # Expired, remove it
-                    del self._cache[key]
+                elif age >= self.ttl + self.stale_ttl:
+                    # Too old to serve even as stale, remove it
+                    self._pop(key)
+                    self.expirations += 1
+            self.misses += 1
         return None
     
-    def set(self, key: str, data: Dict):
-        """Cache directory listing with timestamp."""
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl_seconds: Optional[int] = None) -> Any:
+        """Cached listing for `key`, calling `loader()` on a miss.
+
+        A stale entry is returned immediately and refreshed in the background.
+        `ttl_seconds` overrides the TTL for entries that are invalidated on change.
+        """
+        ttl = timedelta(seconds=ttl_seconds) if ttl_seconds else self.ttl
         with self._lock:
-            self._cache[key] = (data, datetime.now())
+            if key in self._cache:
+                data, timestamp, _ = self._cache[key]
+                age = datetime.now() - timestamp
+                if age < ttl:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return data
+                if age < ttl + self.stale_ttl:
+                    self._cache.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        generation = self._begin_load(key)
+                        threading.Thread(target=self._refresh, args=(key, loader, generation), daemon=True,
+                                         name="dir-cache-refresh").start()
+                    return data
+                self._pop(key)
+                self.expirations += 1
+            self.misses += 1
+            generation = self._begin_load(key)
+        try:
+            data = loader()
+        except Exception:
+            with self._lock:
+                self._end_load(key, generation)
+            raise
+        self._store_loaded(key, data, generation)
+        return data
+    
+    def _refresh(self, key: str, loader: Callable[[], Any], generation: int):
+        try:
+            data = loader()
+        except Exception as e:
+            with self._lock:
+                self._end_load(key, generation)
+            self.refresh_failures += 1
+            print(f"Directory cache refresh failed for {key}: {e}")
+        else:
+            self._store_loaded(key, data, generation)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+    
+    def _begin_load(self, key: str) -> int:
+        """Register a load of `key` and return the generation it started at (caller holds the lock)."""
+        self._loading[key] = self._loading.get(key, 0) + 1
+        return self._generation
+    
+    def _end_load(self, key: str, generation: int) -> bool:
+        """Finish a load (caller holds the lock). False if `key` was invalidated since it started."""
+        current = self._invalidated.get(key, 0) <= generation and self._cleared_at <= generation
+        self._loading[key] -= 1
+        if not self._loading[key]:
+            del self._loading[key]
+            self._invalidated.pop(key, None)
+        return current
+    
+    def _store_loaded(self, key: str, data: Any, generation: int):
+        """Cache what a load returned, unless the key was invalidated while it ran."""
+        size = approximate_size(data)
+        with self._lock:
+            if self._end_load(key, generation):
+                self._store(key, data, size)
+            else:
+                self.discarded_loads += 1
+    
+    def set(self, key: str, data: Any):
+        """Cache directory listing with timestamp, evicting least recently used entries to stay in bounds."""
+        size = approximate_size(data)
+        with self._lock:
+            self._store(key, data, size)
+    
+    def _store(self, key: str, data: Any, size: int):
+        """Insert an entry and evict down to the bounds (caller holds the lock)."""
+        self._pop(key)
+        if size > self.max_bytes:
+            # Bigger than the whole cache: don't evict everything else for it
+            return
+        self._cache[key] = (data, datetime.now(), size)
+        self.total_bytes += size
+        while len(self._cache) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._cache))
+            self._pop(oldest)
+            self.evictions += 1
+        self._ensure_sweeper()
+    
+    def _pop(self, key: str):
+        """Remove an entry and its byte count (caller holds the lock)."""
+        entry = self._cache.pop(key, None)
+        if entry:
+            self.total_bytes -= entry[2]
+    
+    def sweep(self) -> int:
+        """Drop every entry too old to be served, even as stale. Returns how many were removed."""
+        cutoff = datetime.now() - self.ttl - self.stale_ttl
+        with self._lock:
+            expired = [key for key, (_, timestamp, _) in self._cache.items() if timestamp <= cutoff]
+            for key in expired:
+                self._pop(key)
+            self.expirations += len(expired)
+        return len(expired)
+    
+    def _ensure_sweeper(self):
+        """Start the expiry sweeper on first use (caller holds the lock)."""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        self._sweeper = threading.Thread(target=self._sweep_loop, daemon=True, name="dir-cache-sweeper")
+        self._sweeper.start()
+    
+    def _sweep_loop(self):
+        while True:
+            time.sleep(SWEEP_INTERVAL)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Directory cache sweep failed: {e}")
+    
+    def stats(self) -> Dict:
+        """Size and hit/miss/eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "approx_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "refreshing": len(self._refreshing),
+                "refresh_failures": self.refresh_failures,
+                "discarded_loads": self.discarded_loads,
+            }
     
     def clear(self):
         """Clear all cached data."""
         with self._lock:
             self._cache.clear()
+            self.total_bytes = 0
+            self._generation += 1
+            self._cleared_at = self._generation
     
     def remove(self, key: str):
-        """Remove specific cache entry."""
+        """Remove specific cache entry (a read of it already in flight won't be cached)."""
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+            self._pop(key)
+            self._generation += 1
+            if key in self._loading:
+                self._invalidated[key] = self._generation
+
+def browse_key(source: str, relative_path: str) -> str:
+    """Cache key for a browsed directory: 'source:path' or 'destination:path'."""
+    source = "source" if source in ("source", "zurg") else "destination"
+    return f"{source}:{relative_path.strip('/')}"
 
 # Global cache instance
 _dir_cache = DirectoryCache(ttl_seconds=300)  # 5 minutes
 
 def get_cache():
     return _dir_cache
-
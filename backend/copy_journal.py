@@ -0,0 +1,167 @@
+"""
+On-disk checkpoint journal for resumable copy jobs.
+
+Each job gets a small JSON file recording which source files are fully
+copied and how far each in-flight file got. Data is written to `<dst>.part`
+and renamed into place when the file completes, so a job that fails,
+is retried or is interrupted by a restart picks up where it stopped
+instead of re-reading everything from the debrid mount.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from database import DATABASE_DIR
+
+JOURNAL_DIR = os.path.join(DATABASE_DIR, "copy_journals")
+PART_SUFFIX = ".part"
+JOURNAL_FLUSH_INTERVAL = 2.0  # Max seconds of progress lost on a crash
+
+
+def journal_path(job_id: int) -> str:
+    return os.path.join(JOURNAL_DIR, f"job_{job_id}.json")
+
+
+class CopyJournal:
+    """Tracks completed files and in-flight offsets for one copy job."""
+
+    def __init__(self, job_id: int, source_path: str, destination_path: str):
+        self.job_id = job_id
+        self.source_path = source_path
+        self.destination_path = destination_path
+        self.completed: Dict[str, Dict] = {}    # src -> {"size", "mtime", "digest"?}
+        self.in_progress: Dict[str, Dict] = {}  # src -> {"offset", "size", "mtime"}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    @classmethod
+    def load(cls, job_id: int, source_path: str, destination_path: str) -> "CopyJournal":
+        """Load the job's journal, or start an empty one if missing or for other paths."""
+        journal = cls(job_id, source_path, destination_path)
+        try:
+            with open(journal_path(job_id)) as f:
+                data = json.load(f)
+            if data.get("source_path") == source_path and data.get("destination_path") == destination_path:
+                journal.completed = data.get("completed", {})
+                journal.in_progress = data.get("in_progress", {})
+        except (OSError, ValueError):
+            pass
+        return journal
+
+    @staticmethod
+    def adopt(old_job_id: int, new_job_id: int) -> bool:
+        """Hand a journal to a new job (used by retry). Returns True if one existed."""
+        try:
+            os.replace(journal_path(old_job_id), journal_path(new_job_id))
+            return True
+        except OSError:
+            return False
+
+    @property
+    def has_progress(self) -> bool:
+        return bool(self.completed or self.in_progress)
+
+    def resumed_bytes(self) -> Dict[str, int]:
+        """Bytes per source file that a resume starts with (completed files and checkpoint offsets)."""
+        with self._lock:
+            resumed = {src: entry.get("offset", 0) for src, entry in self.in_progress.items()}
+            resumed.update({src: entry.get("size", 0) for src, entry in self.completed.items()})
+        return resumed
+
+    def resume_offset(self, src: str, src_stat: os.stat_result, part_path: str) -> int:
+        """Byte offset to resume `src` from, or 0 if the checkpoint can't be trusted."""
+        with self._lock:
+            entry = self.in_progress.get(src)
+        if not entry or entry.get("size") != src_stat.st_size or entry.get("mtime") != src_stat.st_mtime:
+            return 0
+        try:
+            part_size = os.path.getsize(part_path)
+        except OSError:
+            return 0
+        # Never trust bytes beyond what both the journal and the .part file have
+        return min(entry.get("offset", 0), part_size)
+
+    def is_complete(self, src: str, src_stat: os.stat_result, dst: str) -> bool:
+        """True if `src` was already copied to `dst` and neither side changed since."""
+        with self._lock:
+            entry = self.completed.get(src)
+        if not entry or entry.get("size") != src_stat.st_size or entry.get("mtime") != src_stat.st_mtime:
+            return False
+        try:
+            return os.path.getsize(dst) == src_stat.st_size
+        except OSError:
+            return False
+
+    def update(self, src: str, src_stat: os.stat_result, offset: int, part_path: Optional[str] = None):
+        """
+        Record progress within a file (flushed to disk at most every few seconds).
+        `part_path` is given once, before the .part file is opened.
+        """
+        with self._lock:
+            part_path = part_path or self.in_progress.get(src, {}).get("part")
+            self.in_progress[src] = {"offset": offset, "size": src_stat.st_size, "mtime": src_stat.st_mtime}
+            if part_path:
+                self.in_progress[src]["part"] = part_path
+            if time.monotonic() - self._last_flush >= JOURNAL_FLUSH_INTERVAL:
+                self._flush_locked()
+
+    def complete(self, src: str, src_stat: os.stat_result, digest: Optional[str] = None, cloned: bool = False):
+        """Mark a file as fully copied (with its checksum when verification is on) or cloned."""
+        with self._lock:
+            self.in_progress.pop(src, None)
+            self.completed[src] = {"size": src_stat.st_size, "mtime": src_stat.st_mtime}
+            if digest:
+                self.completed[src]["digest"] = digest
+            if cloned:
+                self.completed[src]["cloned"] = True
+            self._flush_locked()
+
+    def part_paths(self) -> List[str]:
+        """The .part files this job opened and hasn't finished."""
+        with self._lock:
+            return [entry["part"] for entry in self.in_progress.values() if entry.get("part")]
+
+    def completed_digest(self, src: str) -> Optional[str]:
+        with self._lock:
+            return self.completed.get(src, {}).get("digest")
+
+    def was_cloned(self, src: str) -> bool:
+        with self._lock:
+            return bool(self.completed.get(src, {}).get("cloned"))
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def discard(self):
+        """Delete the journal (job finished or was cancelled)."""
+        with self._lock:
+            self.completed.clear()
+            self.in_progress.clear()
+            try:
+                os.remove(journal_path(self.job_id))
+            except OSError:
+                pass
+
+    def _flush_locked(self):
+        """Atomically write the journal to disk. Caller holds the lock."""
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        data = {
+            "job_id": self.job_id,
+            "source_path": self.source_path,
+            "destination_path": self.destination_path,
+            "completed": self.completed,
+            "in_progress": self.in_progress,
+            "updated_at": time.time(),
+        }
+        path = journal_path(self.job_id)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to write copy journal for job {self.job_id}: {e}")
+        self._last_flush = time.monotonic()
@@ -0,0 +1,97 @@
+"""
+Copy plan for a job, built with a single walk of the source.
+
+One os.scandir pass lists every directory and file and (optionally) stats
+each file once. The result gives the job's total size, the directories to
+create and the (source, destination) file pairs, and each file's stat is
+handed to the copy itself. On FUSE mounts, where every listing and stat is a
+network round trip, this replaces the separate size walk, copy walk and
+per-file re-stats.
+
+Like shutil.copytree, symlinked files and directories are followed and
+copied as regular ones (a directory reached twice, e.g. through a link
+loop, is only copied once). A directory that can't be listed or a file that
+can't be stat'ed raises OSError, so the job fails rather than completing
+with part of the tree missing; only files that vanish while being walked
+are skipped.
+"""
+import errno
+import os
+from typing import List, NamedTuple, Optional, Tuple
+
+
+class ManifestFile(NamedTuple):
+    src: str
+    dst: str
+    rel_path: str
+    stat: Optional[os.stat_result]  # None when built without stats
+
+    @property
+    def size(self) -> int:
+        return self.stat.st_size if self.stat else 0
+
+
+class CopyManifest:
+    """Directories and files to copy from `source` to `destination`."""
+
+    def __init__(self, source: str, destination: str):
+        self.source = source
+        self.destination = destination
+        self.dirs: List[Tuple[str, str]] = []  # (src_dir, dst_dir), parents first
+        self.files: List[ManifestFile] = []
+        self.total_size = 0
+
+    @classmethod
+    def build(cls, source: str, destination: str, stat_files: bool = True) -> "CopyManifest":
+        """
+        Walk `source` once. With `stat_files=False` only names are collected
+        (directory entries carry their type, so no stat calls at all) and
+        each file is stat'ed later by the copy itself.
+        """
+        manifest = cls(source, destination)
+        visited = set()  # (st_dev, st_ino) of every directory walked, so link loops end
+        pending = [(source, destination, "")]
+        while pending:
+            src_dir, dst_dir, rel_dir = pending.pop()
+            # One stat per directory (not per file)
+            dir_stat = os.stat(src_dir)
+            if (dir_stat.st_dev, dir_stat.st_ino) in visited:
+                print(f"Manifest: {src_dir} was already copied (symlink loop?), skipping")
+                continue
+            visited.add((dir_stat.st_dev, dir_stat.st_ino))
+            manifest.dirs.append((src_dir, dst_dir))
+            with os.scandir(src_dir) as entries:
+                entries = sorted(entries, key=lambda e: e.name)
+            subdirs = []
+            for entry in entries:
+                rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                dst_path = os.path.join(dst_dir, entry.name)
+                try:
+                    # Follows symlinks, like shutil.copytree
+                    if entry.is_dir():
+                        subdirs.append((entry.path, dst_path, rel_path))
+                        continue
+                    stat = entry.stat() if stat_files else None
+                except OSError as e:
+                    if e.errno == errno.ENOENT:
+                        continue  # Removed since it was listed (or a broken symlink)
+                    raise
+                manifest.files.append(ManifestFile(entry.path, dst_path, rel_path, stat))
+                if stat:
+                    manifest.total_size += stat.st_size
+            # Depth first, in name order
+            pending.extend(reversed(subdirs))
+        return manifest
+
+    @classmethod
+    def for_file(cls, source: str, destination: str) -> "CopyManifest":
+        """Manifest for a single-file job (one stat)."""
+        manifest = cls(source, destination)
+        stat = os.stat(source)
+        manifest.files.append(ManifestFile(source, destination, os.path.basename(source), stat))
+        manifest.total_size = stat.st_size
+        return manifest
+
+    @property
+    def has_stats(self) -> bool:
+        return all(f.stat is not None for f in self.files)
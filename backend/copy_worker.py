@@ -3,24 +3,110 @@ import shutil
 import os
 import asyncio
 from datetime import datetime
-from typing import Set, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Set, Optional, Dict
+from sqlalchemy import case
 from sqlalchemy.orm import Session
 from database import SessionLocal
 from models import CopyJob, SystemSettings
 import time
+import folder_index
 from discord_notifier import discord_notifier
+from fast_copy import (
+    DEFAULT_TRANSFER_BACKEND, TRANSFER_BACKENDS, FileCloner, copy_fd, methods_for_source
+)
+from copy_journal import CopyJournal, PART_SUFFIX
+from checksum import StreamVerifier, ChecksumMismatchError, combine_digests, hash_file
+from rate_limit import MB, TokenBucket, parse_schedule, scheduled_limit
+from copy_manifest import CopyManifest
+from progress_registry import progress_registry
+from post_copy import PostCopyPipeline
+from space_admission import (
+    HELD_STATUS, InsufficientSpaceError, admit, available_for, device_of, get_space_policy, link_methods,
+    remaining_bytes, reservation
+)
 from security_utils import decrypt_value
 
 
+# Defaults for the concurrency limits (overridable via SystemSettings)
+DEFAULT_MAX_CONCURRENT_JOBS = 2
+DEFAULT_MAX_JOBS_PER_SOURCE = 2
+DEFAULT_MAX_JOBS_PER_DESTINATION = 2
+
+# Parallel file streams used when copying a directory (e.g. a season pack)
+DEFAULT_STREAMS_PER_JOB = 4
+MAX_STREAMS_PER_JOB = 8
+
+# Dispatch is driven by notify_new_jobs(); the queue table is only rescanned
+# this often as a fallback (jobs added by another process, missed signals)
+FALLBACK_SCAN_INTERVAL = 30
+RATE_REFRESH_INTERVAL = 2  # Re-apply bandwidth settings while jobs are running
+
+# Sync modes: only copy files missing or changed at the destination
+SYNC_MODES = ("size_mtime", "hash")
+SYNC_MTIME_TOLERANCE = 1.0  # Seconds (some filesystems store coarse mtimes)
+
+# A queued job at least this many priority levels above a running one may
+# pause it when no slot is free (0 = never preempt)
+DEFAULT_PREEMPT_PRIORITY_GAP = 1
+
+# How long stop() waits for running copies to checkpoint (Docker sends
+# SIGKILL 10s after SIGTERM by default)
+SHUTDOWN_TIMEOUT = 8.0
+
+
+class JobPaused(InterruptedError):
+    """
+    Raised at a chunk boundary when a running job has to step aside (a more
+    urgent job, or shutdown). The job is checkpointed and requeued; `reason`
+    is shown on it until it resumes.
+    """
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class StreamAborted(Exception):
+    """Raised in a copy stream when another stream of the same job has failed."""
+
+
+def _urgency(priority: Optional[int]) -> int:
+    """Priority level used for preemption. Queue positions from reordering (100+) count as normal."""
+    if priority is None or priority > 2:
+        return 1
+    return priority
+
+
+def _queue_order():
+    """
+    The one order jobs are taken in, by dispatch, preemption and held-job
+    admission alike: urgency level (as _urgency), then queue position from
+    reordering, then age. So a job marked high priority after a reorder still
+    goes first, and the job preemption acts for is the one dispatch picks next.
+    """
+    urgency = case((CopyJob.priority.is_(None), 1), (CopyJob.priority > 2, 1), else_=CopyJob.priority)
+    return urgency.desc(), CopyJob.priority.desc(), CopyJob.created_at
+
+
 class CopyWorker:
     def __init__(self):
         self.is_running = False
-        self.thread = None
-        self.current_job_id = None
+        self.thread = None  # Dispatcher thread
         self.websocket_manager = None
         self.scanner = None # For triggering stats updates
         self.stop_flag = False
         self.cancelled_jobs: Set[int] = set()  # Track cancelled job IDs
+        self.paused_jobs: Dict[int, int] = {}  # Running job_id -> id of the urgent job it is pausing for
+        self.active_jobs: Dict[int, Dict] = {}  # job_id -> {"thread", "source_device", "destination_device", "limiter"}
+        self._active_lock = threading.Lock()
+        self.global_limiter = TokenBucket()  # Shared by all jobs; per-job buckets live in active_jobs
+        self._wakeup = threading.Condition()  # Signalled when there may be a job to dispatch
+        self._work_pending = False
+        # Notifications and stats refresh run after a job, off the copy threads
+        self.post_copy = PostCopyPipeline()
+        self.post_copy.register("discord", self._send_discord_notification)
+        self.post_copy.register("storage_stats", self._refresh_storage_stats, statuses=("completed",), coalesce=True)
         
     def set_websocket_manager(self, manager):
         """Set the WebSocket manager for broadcasting progress."""
@@ -29,67 +115,418 @@ class CopyWorker:
     def set_scanner(self, scanner):
         """Set the scanner instance for triggering stats updates."""
         self.scanner = scanner
+
+    def is_job_active(self, job_id: int) -> bool:
+        """Check whether a job is currently being processed by a pool thread."""
+        with self._active_lock:
+            return job_id in self.active_jobs
     
     def cancel_job(self, job_id: int):
         """
         Cancel a specific job. 
-        If it's the current job, marks it for cancellation.
-        If it's queued, marks it as cancelled immediately.
+        If it's running, marks it for cancellation.
+        If it's queued, held or paused, cancels it immediately and removes
+        its partial data and checkpoint.
         """
         self.cancelled_jobs.add(job_id)
         print(f"Job {job_id} marked for cancellation")
         
-        # If this isn't the current job, update it in DB immediately
-        if self.current_job_id != job_id:
-            db = SessionLocal()
-            try:
+        db = SessionLocal()
+        try:
+            # Holding the lock keeps the dispatcher from starting it meanwhile;
+            # once it's marked cancelled no pool thread will pick it up
+            with self._active_lock:
+                if job_id in self.active_jobs:
+                    return  # The pool thread finalizes it
                 job = db.query(CopyJob).filter(CopyJob.id == job_id).first()
-                if job and job.status in ['queued', 'processing']:
-                    job.status = 'cancelled'
-                    job.error_message = 'Cancelled by user'
-                    db.commit()
-                    print(f"Job {job_id} cancelled (was {job.status})")
-            finally:
-                db.close()
+                if not job or job.status not in ['queued', 'processing', HELD_STATUS]:
+                    self.cancelled_jobs.discard(job_id)
+                    return
+                previous = job.status
+                self._store_live_progress(job)
+                job.status = 'cancelled'
+                job.error_message = 'Cancelled by user'
+                job.completed_at = datetime.utcnow()
+                db.commit()
+            print(f"Job {job_id} cancelled (was {previous})")
+            
+            # A paused or resumable job has .part files and a journal to clean up
+            journal = CopyJournal.load(job.id, job.source_path, job.destination_path)
+            self._remove_partial_copy(job, journal, written=journal.has_progress)
+            self._broadcast_progress(job)
+            self.cancelled_jobs.discard(job_id)
+        finally:
+            db.close()
     
     def start(self):
-        """Start the background worker thread."""
+        """Start the background dispatcher thread."""
         if not self.is_running:
+            self._requeue_interrupted_jobs()
             self.is_running = True
             self.stop_flag = False
             self.thread = threading.Thread(target=self._worker_loop, daemon=True)
             self.thread.start()
+            self.post_copy.start()
             print("Copy worker started")
     
-    def stop(self):
-        """Stop the background worker thread."""
+    def stop(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """
+        Stop taking new jobs and let running copies checkpoint at their next
+        chunk; they go back to the queue and resume on the next start. A job
+        that doesn't reach a chunk boundary within `timeout` stays 'processing'
+        and is requeued on startup instead.
+        """
         self.stop_flag = True
         self.is_running = False
+        self.notify_new_jobs()
+        deadline = time.monotonic() + timeout
         if self.thread:
-            self.thread.join(timeout=5)
+            self.thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        
+        with self._active_lock:
+            threads = [info["thread"] for info in self.active_jobs.values()]
+        for thread in threads:
+            try:
+                thread.join(timeout=max(0.0, deadline - time.monotonic()))
+            except RuntimeError:
+                pass  # Dispatched but not started yet; it will see stop_flag
+        
+        with self._active_lock:
+            unfinished = list(self.active_jobs)
+        # Let queued notifications go out with whatever time is left
+        self.post_copy.stop(timeout=max(0.5, deadline - time.monotonic()))
+        if not unfinished:
+            if threads:
+                print(f"Copy worker stopped, {len(threads)} running job(s) checkpointed")
+            return
+        print(f"Copy worker stopped, jobs {unfinished} did not checkpoint in time and will resume on next start")
+        # Their journals are at most a few seconds behind; save the latest progress too
+        db = SessionLocal()
+        try:
+            progress_registry.flush(db)
+        except Exception as e:
+            print(f"Failed to save progress on shutdown: {e}")
+        finally:
+            db.close()
+    
+    def notify_new_jobs(self):
+        """Wake the dispatcher (a job was queued or a pool slot freed up)."""
+        with self._wakeup:
+            self._work_pending = True
+            self._wakeup.notify()
+    
+    def _requeue_interrupted_jobs(self):
+        """
+        Jobs still marked 'processing' when the worker starts were cut off by a
+        restart. Put them back in the queue; their journals let them resume.
+        """
+        db = SessionLocal()
+        try:
+            jobs = db.query(CopyJob).filter(CopyJob.status == "processing").all()
+            for job in jobs:
+                job.status = "queued"
+                job.error_message = "Interrupted by restart, resuming"
+                print(f"Requeued interrupted job {job.id}")
+            db.commit()
+        except Exception as e:
+            print(f"Failed to requeue interrupted jobs: {e}")
+        finally:
+            db.close()
     
     def _worker_loop(self):
-        """Main worker loop that processes queued jobs."""
+        """
+        Dispatcher loop that hands queued jobs to the worker pool. It sleeps
+        until notify_new_jobs() is called, only scanning the queue table on a
+        signal or every FALLBACK_SCAN_INTERVAL seconds.
+        """
+        scan_due = True  # Always look at the queue on startup
+        last_scan = 0.0
         while self.is_running and not self.stop_flag:
             db = SessionLocal()
             try:
-                # Get the next queued job (highest priority first, then oldest)
-                job = db.query(CopyJob).filter(
-                    CopyJob.status == "queued"
-                ).order_by(CopyJob.priority.desc(), CopyJob.created_at).first()
+                # Keep setting and schedule changes flowing to running copies
+                if self.active_jobs:
+                    self.refresh_rate_limits(db)
+                # Persist live progress for all running jobs in one write
+                if progress_registry.flush_due():
+                    progress_registry.flush(db)
                 
-                if job:
-                    self.current_job_id = job.id
-                    self._process_job(db, job)
-                    self.current_job_id = None
-                else:
-                    # No jobs in queue, wait a bit
-                    time.sleep(2)
+                if scan_due:
+                    self._admit_held_jobs(db)
+                    limits = self._get_concurrency_limits(db)
+                    job = None
+                    if len(self.active_jobs) < limits["max_jobs"]:
+                        job = self._next_dispatchable_job(db, limits)
+                    if job:
+                        self._dispatch_job(job)
+                        continue  # There may be more, scan again straight away
+                    self._preempt_for_urgent_job(db, limits)
+                    scan_due = False
+                    last_scan = time.monotonic()
             except Exception as e:
                 print(f"Error in worker loop: {e}")
                 time.sleep(5)
+                continue
             finally:
                 db.close()
+            
+            # Pool is full or nothing can run yet: wait for a signal
+            with self._wakeup:
+                if self.active_jobs:
+                    timeout = RATE_REFRESH_INTERVAL
+                else:
+                    timeout = max(0.0, FALLBACK_SCAN_INTERVAL - (time.monotonic() - last_scan))
+                self._wakeup.wait_for(lambda: self._work_pending or self.stop_flag, timeout)
+                if self._work_pending:
+                    self._work_pending = False
+                    scan_due = True
+            if time.monotonic() - last_scan >= FALLBACK_SCAN_INTERVAL:
+                scan_due = True
+
+    def _get_int_setting(self, db: Session, key: str, default: int) -> int:
+        """Read an integer SystemSettings value, falling back to a default."""
+        setting = db.query(SystemSettings).filter(SystemSettings.key == key).first()
+        if setting and setting.value:
+            try:
+                return int(setting.value)
+            except ValueError:
+                pass
+        return default
+
+    def _get_float_setting(self, db: Session, key: str, default: float) -> float:
+        """Read a numeric SystemSettings value, falling back to a default."""
+        setting = db.query(SystemSettings).filter(SystemSettings.key == key).first()
+        if setting and setting.value:
+            try:
+                return float(setting.value)
+            except ValueError:
+                pass
+        return default
+
+    def _get_bool_setting(self, db: Session, key: str, default: bool) -> bool:
+        """Read a "true"/"false" SystemSettings value, falling back to a default."""
+        setting = db.query(SystemSettings).filter(SystemSettings.key == key).first()
+        if setting and setting.value:
+            return setting.value == "true"
+        return default
+
+    def _get_concurrency_limits(self, db: Session) -> Dict[str, int]:
+        """Load pool size and per-device limits from settings."""
+        return {
+            "max_jobs": max(1, self._get_int_setting(db, "copy_max_concurrent_jobs", DEFAULT_MAX_CONCURRENT_JOBS)),
+            "per_source": max(1, self._get_int_setting(db, "copy_max_jobs_per_source", DEFAULT_MAX_JOBS_PER_SOURCE)),
+            "per_destination": max(1, self._get_int_setting(db, "copy_max_jobs_per_destination", DEFAULT_MAX_JOBS_PER_DESTINATION)),
+        }
+
+    def _get_device(self, path: str) -> Optional[int]:
+        """Return st_dev of a path, or of its nearest existing parent."""
+        return device_of(path)
+
+    def _get_cloner(self, db: Session, job: CopyJob) -> FileCloner:
+        """Link methods to try for this job: none unless source and destination share a filesystem."""
+        return FileCloner(link_methods(db, job.source_path, job.destination_path))
+
+    def _get_transfer_backend(self, db: Session, job: CopyJob) -> str:
+        """The job's own transfer backend, else the copy_transfer_backend setting."""
+        if job.transfer_backend in TRANSFER_BACKENDS:
+            return job.transfer_backend
+        setting = db.query(SystemSettings).filter(SystemSettings.key == "copy_transfer_backend").first()
+        return setting.value if setting and setting.value in TRANSFER_BACKENDS else DEFAULT_TRANSFER_BACKEND
+
+    def _admit_held_jobs(self, db: Session):
+        """Move jobs held for free space back to the queue once they fit."""
+        held = db.query(CopyJob).filter(CopyJob.status == HELD_STATUS).order_by(*_queue_order()).all()
+        for job in held:
+            if job.id in self.cancelled_jobs:
+                continue  # Being cancelled right now
+            try:
+                status, reason = admit(db, job.destination_path, reservation(db, job), exclude_job_id=job.id)
+            except InsufficientSpaceError:
+                continue  # Policy switched to "reject"; leave it held until space frees up
+            if status == "queued":
+                job.status = "queued"
+                job.error_message = None
+                db.commit()
+                print(f"Job {job.id} admitted, enough free space on destination")
+            elif reason != job.error_message:
+                job.error_message = reason
+                db.commit()
+
+    def refresh_rate_limits(self, db: Optional[Session] = None):
+        """
+        Apply the bandwidth settings to the token buckets: the global limit
+        (or the schedule window in effect right now) and each running job's
+        own limit (the job's override, else the per-job default). In MB/s, 0 = unlimited.
+        """
+        own_session = db is None
+        if own_session:
+            db = SessionLocal()
+        try:
+            global_limit = self._get_float_setting(db, "copy_rate_limit_mb_per_sec", 0)
+            schedule_setting = db.query(SystemSettings).filter(SystemSettings.key == "copy_rate_schedule").first()
+            try:
+                schedule = parse_schedule(schedule_setting.value if schedule_setting else None)
+            except ValueError as e:
+                print(f"Ignoring invalid copy rate schedule: {e}")
+                schedule = []
+            self.global_limiter.set_rate(scheduled_limit(schedule, global_limit) * MB)
+            
+            with self._active_lock:
+                limiters = {job_id: info["limiter"] for job_id, info in self.active_jobs.items()}
+            if limiters:
+                job_default = self._get_float_setting(db, "copy_job_rate_limit_mb_per_sec", 0)
+                overrides = dict(
+                    db.query(CopyJob.id, CopyJob.rate_limit_mb_per_sec)
+                    .filter(CopyJob.id.in_(list(limiters)))
+                    .all()
+                )
+                for job_id, limiter in limiters.items():
+                    limit = overrides.get(job_id)
+                    limiter.set_rate((job_default if limit is None else limit) * MB)
+        finally:
+            if own_session:
+                db.close()
+
+    def _store_live_progress(self, job: CopyJob):
+        """Stop live tracking and copy the last values onto the job row."""
+        live = progress_registry.finish(job.id)
+        if live:
+            job.copied_size_bytes = live["copied_size_bytes"]
+            job.progress_percent = live["progress_percent"]
+
+    def _check_interrupted(self, job_id: int):
+        """Raise if a running job was cancelled, has to pause for a more urgent one, or the worker is stopping."""
+        if job_id in self.cancelled_jobs:
+            raise InterruptedError(f"Job {job_id} cancelled by user")
+        if self.stop_flag:
+            raise JobPaused(f"Job {job_id} checkpointed for shutdown", "Interrupted by shutdown, resuming")
+        preempted_by = self.paused_jobs.get(job_id)
+        if preempted_by:
+            raise JobPaused(f"Job {job_id} paused for job {preempted_by}",
+                            f"Paused for higher priority job {preempted_by}")
+
+    def _throttle(self, job_id: int, nbytes: int):
+        """Block the calling copy thread until the global and job buckets allow `nbytes`."""
+        if nbytes <= 0:
+            return
+        should_stop = lambda: job_id in self.cancelled_jobs or job_id in self.paused_jobs or self.stop_flag
+        self.global_limiter.consume(nbytes, should_stop)
+        info = self.active_jobs.get(job_id)
+        if info:
+            info["limiter"].consume(nbytes, should_stop)
+
+    def _next_dispatchable_job(self, db: Session, limits: Dict[str, int]) -> Optional[CopyJob]:
+        """
+        Pick the highest priority queued job whose source and destination
+        devices still have free slots. Jobs blocked on a busy device are
+        skipped so jobs on other devices can run in the meantime.
+        """
+        with self._active_lock:
+            active = dict(self.active_jobs)
+        
+        source_counts: Dict[Optional[int], int] = {}
+        dest_counts: Dict[Optional[int], int] = {}
+        for info in active.values():
+            source_counts[info["source_device"]] = source_counts.get(info["source_device"], 0) + 1
+            dest_counts[info["destination_device"]] = dest_counts.get(info["destination_device"], 0) + 1
+        
+        candidates = db.query(CopyJob).filter(
+            CopyJob.status == "queued"
+        ).order_by(*_queue_order()).limit(50).all()
+        
+        for job in candidates:
+            if job.id in active:
+                continue
+            # Cancelled jobs are picked straight away so _process_job can finalize them
+            if job.id in self.cancelled_jobs:
+                return job
+            
+            source_device = self._get_device(job.source_path)
+            dest_device = self._get_device(job.destination_path)
+            if source_counts.get(source_device, 0) >= limits["per_source"]:
+                continue
+            if dest_counts.get(dest_device, 0) >= limits["per_destination"]:
+                continue
+            return job
+        return None
+
+    def _preempt_for_urgent_job(self, db: Session, limits: Dict[str, int]):
+        """
+        Called when no queued job can start. If the most urgent queued job
+        outranks a running one by copy_preempt_priority_gap levels, and
+        pausing that job would free the slot it is waiting for, ask the running
+        job to pause at its next chunk. It checkpoints, goes back to the queue
+        and resumes once a slot is free again. One preemption at a time.
+        """
+        gap = self._get_int_setting(db, "copy_preempt_priority_gap", DEFAULT_PREEMPT_PRIORITY_GAP)
+        if gap <= 0 or self.paused_jobs:
+            return
+        with self._active_lock:
+            active = dict(self.active_jobs)
+        if not active:
+            return
+        
+        urgent = db.query(CopyJob).filter(
+            CopyJob.status == "queued",
+            CopyJob.id.notin_(list(active)),
+        ).order_by(*_queue_order()).first()
+        if not urgent or urgent.id in self.cancelled_jobs:
+            return
+        source_device = self._get_device(urgent.source_path)
+        dest_device = self._get_device(urgent.destination_path)
+        
+        victim = None
+        running = db.query(CopyJob).filter(CopyJob.id.in_(list(active)), CopyJob.status == "processing").all()
+        for job in running:
+            if _urgency(urgent.priority) - _urgency(job.priority) < gap or job.id in self.cancelled_jobs:
+                continue
+            # Would the urgent job fit once this one is out of the way?
+            others = [info for job_id, info in active.items() if job_id != job.id]
+            if len(others) >= limits["max_jobs"]:
+                continue
+            if sum(1 for info in others if info["source_device"] == source_device) >= limits["per_source"]:
+                continue
+            if sum(1 for info in others if info["destination_device"] == dest_device) >= limits["per_destination"]:
+                continue
+            # Least urgent first, then the one with the most left to copy
+            key = (_urgency(job.priority), -remaining_bytes(job))
+            if victim is None or key < victim[0]:
+                victim = (key, job)
+        
+        if victim:
+            job = victim[1]
+            self.paused_jobs[job.id] = urgent.id
+            print(f"Pausing job {job.id} (priority {job.priority}) for job {urgent.id} (priority {urgent.priority})")
+
+    def _dispatch_job(self, job: CopyJob):
+        """Start a pool thread for a job and register it as active."""
+        thread = threading.Thread(target=self._run_job, args=(job.id,), daemon=True)
+        with self._active_lock:
+            self.active_jobs[job.id] = {
+                "thread": thread,
+                "source_device": self._get_device(job.source_path),
+                "destination_device": self._get_device(job.destination_path),
+                "limiter": TokenBucket(),
+            }
+        thread.start()
+
+    def _run_job(self, job_id: int):
+        """Pool thread entry point: process one job with its own DB session."""
+        db = SessionLocal()
+        try:
+            job = db.query(CopyJob).filter(CopyJob.id == job_id).first()
+            # Shutting down: leave it queued for the next start
+            if job and job.status == "queued" and not self.stop_flag:
+                self._process_job(db, job)
+        except Exception as e:
+            print(f"Error running job {job_id}: {e}")
+        finally:
+            db.close()
+            with self._active_lock:
+                self.active_jobs.pop(job_id, None)
+            self.paused_jobs.pop(job_id, None)
+            # A slot (and maybe a device) is free again
+            self.notify_new_jobs()
     
     def _process_job(self, db: Session, job: CopyJob):
         """Process a single copy job."""
@@ -97,25 +534,54 @@ class CopyWorker:
         
         # Check if job was cancelled before starting
         if job.id in self.cancelled_jobs:
+            journal = CopyJournal.load(job.id, job.source_path, job.destination_path)
+            self._remove_partial_copy(job, journal, written=journal.has_progress)
             job.status = "cancelled"
             job.error_message = "Cancelled by user before processing"
+            job.completed_at = datetime.utcnow()
             db.commit()
-            self.cancelled_jobs.remove(job.id)
+            self.cancelled_jobs.discard(job.id)
             return
         
+        # Cancel and pause clean-up need it, even if they happen before the copy starts
+        journal = CopyJournal.load(job.id, job.source_path, job.destination_path)
         try:
             # Update status to processing
             job.status = "processing"
             job.progress_percent = 0
+            job.error_message = None  # e.g. a note that the job was paused
             db.commit()
             self._broadcast_progress(job)
+            self.refresh_rate_limits(db)
             
             # Check if source exists
             if not os.path.exists(job.source_path):
                 raise Exception(f"Source path does not exist: {job.source_path}")
             
-            # Calculate total size
-            total_size = self._get_total_size(job.source_path)
+            # One walk of the source gives both the copy plan and the total size.
+            # If the folder size index knows the source, skip the per-file stats
+            # here; each file is stat'ed once when it is copied and the real
+            # byte count replaces the estimate at the end.
+            is_directory = os.path.isdir(job.source_path)
+            if is_directory:
+                known_size = None if job.sync_mode else folder_index.current_size(db, job.source_path)
+                manifest = CopyManifest.build(job.source_path, job.destination_path,
+                                              stat_files=known_size is None)
+                total_size = manifest.total_size if known_size is None else known_size
+            else:
+                dest_path = job.destination_path
+                if os.path.isdir(dest_path):
+                    dest_path = os.path.join(dest_path, os.path.basename(job.source_path))
+                manifest = CopyManifest.for_file(job.source_path, dest_path)
+                total_size = manifest.total_size
+            
+            # Only the files that need copying count when syncing
+            unchanged: Dict[str, Optional[str]] = {}
+            if job.sync_mode:
+                unchanged, skipped_bytes = self._find_unchanged_files(job, manifest)
+                total_size -= skipped_bytes
+                job.skipped_size_bytes = skipped_bytes
+                print(f"Job {job.id}: sync skipping {len(unchanged)} unchanged files ({self._format_size(skipped_bytes)})")
             job.total_size_bytes = total_size
             db.commit()
             
@@ -124,18 +590,55 @@ class CopyWorker:
             if not os.path.exists(dest_parent):
                 os.makedirs(dest_parent, exist_ok=True)
             
+            # The checkpoint journal is non-empty when retrying or resuming after a restart
+            if journal.has_progress:
+                print(f"Job {job.id}: resuming from checkpoint ({len(journal.completed)} files already complete)")
+            # Bytes already on disk count as copied from the start, not as throughput
+            resumed = journal.resumed_bytes()
+            progress_registry.start(job.id, total_size, sum(resumed.values()))
+            
+            # Shutdown may have started while the source was being walked
+            if self.stop_flag:
+                raise JobPaused(f"Job {job.id} not started, shutting down", "Interrupted by shutdown, resuming")
+            
+            # Same filesystem: reflink/hardlink files instead of copying their data
+            cloner = self._get_cloner(db, job)
+            backend = self._get_transfer_backend(db, job)
+            
+            # Preflight: hold or fail now rather than hours in when the drive fills up
+            # (skipped when resuming, part of the data is already there, and when linking)
+            policy, margin = get_space_policy(db)
+            if policy != "off" and not journal.has_progress and not cloner.methods:
+                available = available_for(db, job.destination_path, margin, exclude_job_id=job.id)
+                if available is not None and total_size > available:
+                    error = InsufficientSpaceError(total_size, available, job.destination_path)
+                    if policy == "reject":
+                        raise error
+                    # Back to held: the slot is released and _admit_held_jobs re-queues it once it fits
+                    print(f"Job {job.id} held: {error}")
+                    progress_registry.finish(job.id)
+                    job.status = HELD_STATUS
+                    job.error_message = f"Waiting for free space: {error}"
+                    db.commit()
+                    self._broadcast_progress(job)
+                    return
+            
             # Perform the copy with progress tracking
-            copied_bytes = [0]  # Use list to allow modification in nested function
-            last_update = [0]  # Track last update to avoid too frequent updates
-            last_db_update_time = [0] # Track last DB update time to prevent blocking (max 1/sec)
-            file_bytes_tracked = {}  # Track bytes per file to avoid double-counting
+            copied_bytes = [sum(resumed.values())]  # Use list to allow modification in nested function
+            last_update = [copied_bytes[0]]  # Track last update to avoid too frequent updates
+            last_broadcast_time = [0] # Track last broadcast time (max 1/sec)
+            file_bytes_tracked = dict(resumed)  # Track bytes per file to avoid double-counting
+            progress_lock = threading.Lock()  # Parallel file streams share the counters and the session
             
             def copy_progress(src, dst, bytes_copied_in_file=None, file_size=None):
                 """Enhanced callback for chunk-level progress tracking."""
                 # Check for cancellation during copy
-                if job.id in self.cancelled_jobs:
-                    raise InterruptedError(f"Job {job.id} cancelled by user")
+                self._check_interrupted(job.id)
                 
+                with progress_lock:
+                    _record_progress(src, bytes_copied_in_file, file_size)
+            
+            def _record_progress(src, bytes_copied_in_file, file_size):
                 # Handle chunk-level progress (new signature)
                 if bytes_copied_in_file is not None and file_size is not None:
                     # Track the highest bytes_copied for this file to avoid double counting
@@ -154,158 +657,408 @@ class CopyWorker:
                         copied_bytes[0] += size
                         file_bytes_tracked[src] = size
                 
-                # Update progress more frequently - but THROTTLE DB writes to max once per second
-                # This prevents holding the SQLite lock too often which blocks the API
+                # Live progress lives in memory; the worker flushes it to the DB in batches
+                progress_registry.update(job.id, copied_bytes[0])
+                
+                # Throttle WebSocket broadcasts: enough bytes (1% or 1MB) and at most once per second
                 current_time = time.time()
                 update_threshold = max(total_size * 0.01, 1 * 1024 * 1024)
-                
-                # Check safeguards: 
-                # 1. Enough bytes copied since last update (1% or 1MB)
-                # 2. Enough TIME passed since last DB commit (1 second) - preventing "spinning" locks
-                time_since_update = current_time - last_db_update_time[0]
+                time_since_update = current_time - last_broadcast_time[0]
                 
                 if (copied_bytes[0] - last_update[0] >= update_threshold) and (time_since_update >= 1.0):
                     progress = int((copied_bytes[0] / total_size) * 100) if total_size > 0 else 0
-                    job.copied_size_bytes = copied_bytes[0]
-                    job.progress_percent = min(progress, 99)  # Never show 100% until complete
-                    db.commit()
                     self._broadcast_progress(job)
                     last_update[0] = copied_bytes[0]
-                    last_db_update_time[0] = current_time
+                    last_broadcast_time[0] = current_time
                     print(f"Progress update: Job {job.id} - {progress}% ({self._format_size(copied_bytes[0])} / {self._format_size(total_size)})")
             
+            def throttle(nbytes):
+                """Bandwidth limits, charged only for bytes actually transferred."""
+                self._throttle(job.id, nbytes)
+            
+            # Streaming checksums (hash while copying, then sample the destination)
+            verify = self._get_bool_setting(db, "copy_verify_checksums", False)
+            
             # Copy the directory or file
-            if os.path.isdir(job.source_path):
-                # Remove destination if it exists (to avoid conflicts)
-                if os.path.exists(job.destination_path):
+            if is_directory:
+                # Remove destination if it exists (to avoid conflicts), unless we're resuming or syncing into it
+                if os.path.exists(job.destination_path) and not journal.has_progress and not job.sync_mode:
                     if os.path.isdir(job.destination_path):
                         shutil.rmtree(job.destination_path)
                     else:
                         os.remove(job.destination_path)
                 
-                shutil.copytree(
-                    job.source_path,
-                    job.destination_path,
-                    copy_function=lambda src, dst, **kwargs: self._copy_with_callback(src, dst, copy_progress, **kwargs),
-                    dirs_exist_ok=False
-                )
+                streams = self._get_int_setting(db, "copy_streams_per_job", DEFAULT_STREAMS_PER_JOB)
+                digests = self._copy_directory(manifest, copy_progress, streams, journal, verify, unchanged, throttle,
+                                               cloner, backend)
+                if verify:
+                    # None when nothing was copied and a size/mtime sync skipped the rest
+                    job.checksum = combine_digests(digests) if digests else None
             else:
                 # Single file copy with chunked progress
-                dest_path = job.destination_path
-                if os.path.exists(dest_path) and os.path.isdir(dest_path):
-                    dest_path = os.path.join(dest_path, os.path.basename(job.source_path))
-                
-                self._copy_file_with_progress(job.source_path, dest_path, copy_progress)
+                entry = manifest.files[0]
+                if entry.src in unchanged:
+                    digest = unchanged[entry.src] if verify else None
+                else:
+                    digest = self._copy_file_with_progress(entry.src, entry.dst, copy_progress, journal, verify,
+                                                           throttle, entry.stat, cloner, backend)
+                if verify:
+                    job.checksum = digest
+            job.copy_method = cloner.summary()
+            
+            # Everything is in place, the checkpoint is no longer needed
+            journal.discard()
             
             # Mark as completed
+            progress_registry.finish(job.id)
             job.status = "completed"
             job.progress_percent = 100
-            job.copied_size_bytes = total_size
+            # What was actually copied (the index can miss files that changed size in place)
+            job.total_size_bytes = job.copied_size_bytes = copied_bytes[0]
             job.completed_at = datetime.utcnow()
             db.commit()
             self._broadcast_progress(job)
             
-            # Send Discord notification
+            # Discord notification and stats refresh run in the background
             duration = (job.completed_at - job.created_at).total_seconds()
-            self._send_discord_notification(db, job, duration)
-            
-            # Trigger stats update to keep dashboard live
-            if self.scanner:
-                print(f"Job {job.id}: Triggering post-copy stats update...")
-                try:
-                    self.scanner.update_storage_stats(db)
-                except Exception as e:
-                    print(f"Post-copy stats update failed: {e}")
+            self.post_copy.submit(job, duration)
 
+            if job.copy_method in ("reflink", "hardlink"):
+                print(f"Job {job.id}: no data copied, every file was a {job.copy_method}")
+            elif cloner.streamed_with:
+                # Once per job rather than per file
+                methods = ", ".join(f"{name} x{count}" for name, count in cloner.streamed_with.most_common())
+                print(f"Job {job.id}: copy method {job.copy_method}, data moved with {methods}")
+            if job.sync_mode:
+                print(f"Job {job.id} synced: copied {self._format_size(job.copied_size_bytes)}, skipped {self._format_size(job.skipped_size_bytes or 0)} unchanged")
             print(f"Job {job.id} completed successfully")
             
+        except JobPaused as e:
+            # Keep the .part files and checkpoint; back in the queue it resumes where it stopped
+            print(f"{e}")
+            journal.flush()
+            self._store_live_progress(job)
+            job.status = "queued"
+            job.error_message = e.reason
+            db.commit()
+            self._broadcast_progress(job)
+            
         except InterruptedError as e:
             # Job was cancelled - clean up partial file
             print(f"Job {job.id} cancelled: {e}")
             
-            # Delete the partially copied file/directory
-            try:
-                if os.path.exists(job.destination_path):
-                    if os.path.isdir(job.destination_path):
-                        shutil.rmtree(job.destination_path)
-                        print(f"Removed partial directory: {job.destination_path}")
-                    else:
-                        os.remove(job.destination_path)
-                        print(f"Removed partial file: {job.destination_path}")
-            except Exception as cleanup_error:
-                print(f"Error cleaning up partial file: {cleanup_error}")
+            # Delete the partially copied file/directory and its checkpoint
+            self._remove_partial_copy(job, journal, written=True)
             
+            self._store_live_progress(job)
             job.status = "cancelled"
             job.error_message = "Cancelled by user"
             job.completed_at = datetime.utcnow()
             db.commit()
             self._broadcast_progress(job)
             
-            # Send Discord notification
+            # Send Discord notification (in the background)
             duration = (job.completed_at - job.created_at).total_seconds()
-            self._send_discord_notification(db, job, duration)
+            self.post_copy.submit(job, duration)
             
             # Remove from cancelled set
-            if job.id in self.cancelled_jobs:
-                self.cancelled_jobs.remove(job.id)
+            self.cancelled_jobs.discard(job.id)
             
         except Exception as e:
+            # Partial data and the journal are kept so a retry resumes from here
+            # (a file that failed verification is reset to start over)
             print(f"Job {job.id} failed: {e}")
+            self._store_live_progress(job)
             job.status = "failed"
             job.error_message = str(e)
             job.completed_at = datetime.utcnow()
             db.commit()
             self._broadcast_progress(job)
             
-            # Send Discord notification
+            # Send Discord notification (in the background)
             duration = (job.completed_at - job.created_at).total_seconds()
-            self._send_discord_notification(db, job, duration)
-    
-    def _copy_with_callback(self, src, dst, callback, **kwargs):
-        """Copy file with chunk-level progress callback."""
-        if os.path.isfile(src):
-            self._copy_file_with_progress(src, dst, callback)
-        return dst
+            self.post_copy.submit(job, duration)
     
-    def _copy_file_with_progress(self, src: str, dst: str, callback) -> None:
-        """Copy a file in chunks with progress reporting."""
-        chunk_size = 1024 * 1024  # 1MB chunks
+    def _copy_directory(self, manifest: CopyManifest, callback, streams: int = 1,
+                        journal: Optional[CopyJournal] = None, verify: bool = False,
+                        unchanged: Optional[Dict[str, Optional[str]]] = None, throttle=None,
+                        cloner: Optional[FileCloner] = None, backend: Optional[str] = None) -> Dict[str, str]:
+        """
+        Copy a directory tree from its manifest, running up to `streams` file
+        copies at once. Directories are created up front, files are copied by
+        a thread pool, and directory metadata is applied last (like shutil.copytree).
+        Source files in `unchanged` (sync mode) are left as they are and aren't
+        read again. Returns {relative path: digest} when verifying.
+        """
+        streams = max(1, min(streams, MAX_STREAMS_PER_JOB))
+        digests: Dict[str, str] = {}
+        abort = threading.Event()
         
-        # Get file size
-        file_size = os.path.getsize(src)
+        def stream_progress(*args):
+            # Another stream failed: stop this file at the next chunk rather than
+            # finish it for a job that is failing anyway (its .part stays resumable)
+            if abort.is_set():
+                raise StreamAborted("Stopped, another file of this job failed")
+            callback(*args)
         
-        # Copy file content in chunks
-        with open(src, 'rb') as fsrc:
-            with open(dst, 'wb') as fdst:
-                copied = 0
-                while True:
-                    chunk = fsrc.read(chunk_size)
-                    if not chunk:
-                        break
-                    fdst.write(chunk)
-                    copied += len(chunk)
-                    
-                    # Report progress for this chunk
-                    callback(src, dst, copied, file_size)
+        def copy_and_record(entry):
+            if unchanged and entry.src in unchanged:
+                # Already up to date; its digest is only known if the sync compared contents
+                digest = unchanged[entry.src] if verify else None
+            else:
+                digest = self._copy_file_with_progress(entry.src, entry.dst, stream_progress, journal, verify,
+                                                       throttle, entry.stat, cloner, backend)
+            if digest:
+                digests[entry.rel_path] = digest
         
-        # Copy file metadata after content
-        shutil.copystat(src, dst)
-    
-    def _get_total_size(self, path: str) -> int:
-        """Calculate total size of files to be copied."""
-        total_size = 0
-        if os.path.isfile(path):
-            return os.path.getsize(path)
+        for _, target_dir in manifest.dirs:
+            os.makedirs(target_dir, exist_ok=True)
         
-        for dirpath, dirnames, filenames in os.walk(path):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
+        files = list(manifest.files)
+        if streams == 1 or len(files) <= 1:
+            for entry in files:
+                copy_and_record(entry)
+        else:
+            # Largest files first so a long episode doesn't start last and tail the job
+            if manifest.has_stats:
+                files.sort(key=lambda entry: entry.size, reverse=True)
+            
+            def copy_one(entry):
+                if abort.is_set():
+                    return
                 try:
-                    total_size += os.path.getsize(filepath)
-                except (OSError, FileNotFoundError):
-                    pass
-        return total_size
+                    copy_and_record(entry)
+                except BaseException:
+                    abort.set()
+                    raise
+            
+            with ThreadPoolExecutor(max_workers=streams, thread_name_prefix="copy-stream") as pool:
+                futures = [pool.submit(copy_one, entry) for entry in files]
+                first_error = None
+                for future in as_completed(futures):
+                    error = future.exception()
+                    # Prefer reporting a cancellation over follow-on errors from other streams,
+                    # and never report a stream that only stopped because of another's error
+                    if error and (first_error is None or isinstance(first_error, StreamAborted)
+                                  or isinstance(error, InterruptedError)):
+                        first_error = error
+            if first_error:
+                raise first_error
+        
+        # Apply directory metadata bottom-up so file writes don't bump the mtimes again
+        for src_path, target_dir in reversed(manifest.dirs):
+            try:
+                shutil.copystat(src_path, target_dir)
+            except OSError:
+                pass
+        
+        return digests
+
+    def _find_unchanged_files(self, job: CopyJob, manifest: CopyManifest):
+        """
+        Sync mode: find source files whose destination copy is already up to date.
+        "size_mtime" compares size and modification time; "hash" compares size,
+        then the file contents (slower, it reads both sides, so it reports the
+        bytes read as the job's progress and stops for cancel, pause or shutdown).
+        Returns ({unchanged source path: digest of its contents, or None if
+        they weren't read}, their total size in bytes).
+        """
+        unchanged: Dict[str, Optional[str]] = {}
+        skipped_bytes = 0
+        to_hash = []
+        for entry in manifest.files:
+            try:
+                src_stat = entry.stat or os.stat(entry.src)
+                dst_stat = os.stat(entry.dst)
+            except OSError:
+                continue
+            if src_stat.st_size != dst_stat.st_size:
+                continue
+            if job.sync_mode == "hash":
+                to_hash.append((entry, src_stat.st_size))
+            elif abs(src_stat.st_mtime - dst_stat.st_mtime) <= SYNC_MTIME_TOLERANCE:
+                unchanged[entry.src] = None
+                skipped_bytes += src_stat.st_size
+        if not to_hash:
+            return unchanged, skipped_bytes
+        
+        # Until the copy starts, the job's progress is the comparison's
+        progress_registry.start(job.id, 2 * sum(size for _, size in to_hash))
+        hashed = [0]
+        last_broadcast = [time.time()]
+        
+        def on_chunk(nbytes):
+            self._check_interrupted(job.id)
+            hashed[0] += nbytes
+            progress_registry.update(job.id, hashed[0])
+            if time.time() - last_broadcast[0] >= 1.0:
+                last_broadcast[0] = time.time()
+                self._broadcast_progress(job)
+        
+        for entry, size in to_hash:
+            self._check_interrupted(job.id)
+            digest = hash_file(entry.src, on_chunk)
+            if digest != hash_file(entry.dst, on_chunk):
+                continue
+            unchanged[entry.src] = digest
+            skipped_bytes += size
+        return unchanged, skipped_bytes
+
+    def _remove_partial_copy(self, job: CopyJob, journal: CopyJournal, written: bool):
+        """
+        Delete what a cancelled job left behind and its checkpoint. The
+        destination itself is only removed if `written` (by this job); a sync
+        only drops the .part files it was writing, the existing copy stays.
+        """
+        try:
+            if written and not job.sync_mode and os.path.exists(job.destination_path):
+                if os.path.isdir(job.destination_path):
+                    shutil.rmtree(job.destination_path)
+                    print(f"Removed partial directory: {job.destination_path}")
+                else:
+                    os.remove(job.destination_path)
+                    print(f"Removed partial file: {job.destination_path}")
+            # Only the .part files this job opened; any others there aren't ours
+            for part_path in journal.part_paths():
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+        except Exception as cleanup_error:
+            print(f"Error cleaning up partial file: {cleanup_error}")
+        journal.discard()
+
+    def _copy_file_with_progress(self, src: str, dst: str, callback, journal: Optional[CopyJournal] = None,
+                                 verify: bool = False, throttle=None,
+                                 src_stat: Optional[os.stat_result] = None,
+                                 cloner: Optional[FileCloner] = None,
+                                 backend: Optional[str] = None) -> Optional[str]:
+        """
+        Copy a file in chunks with progress reporting (kernel fast path when possible).
+        Data goes to `<dst>.part` and is renamed into place once complete; with a
+        journal, an interrupted copy resumes from its last checkpointed offset.
+        With `verify`, the data is hashed as it streams and the .part file is
+        spot-checked before the rename. `throttle(nbytes)` is charged for each
+        chunk transferred. `src_stat` (from the manifest) saves a stat call.
+        With a `cloner` (same filesystem), the file is reflinked or hard linked
+        instead when possible, which completes instantly. `backend` names the
+        transfer backend (fast_copy.TRANSFER_BACKENDS) to use.
+        Returns the digest when verifying.
+        """
+        src_stat = src_stat or os.stat(src)
+        file_size = src_stat.st_size
+        
+        # Already copied in an earlier attempt?
+        if journal and journal.is_complete(src, src_stat, dst):
+            callback(src, dst, file_size, file_size)
+            if not verify or journal.was_cloned(src):
+                return None
+            # Finished before verification was on: hash the local copy once
+            return journal.completed_digest(src) or hash_file(dst)
+        
+        part_path = dst + PART_SUFFIX
+        if cloner and cloner.methods:
+            linked = self._clone_file(src, dst, part_path, src_stat, cloner)
+            if linked:
+                callback(src, dst, file_size, file_size)
+                # Same data by construction: reading both sides to hash them would
+                # cost what the clone saved, so only the size is checked and the
+                # file stays out of the job checksum
+                if verify:
+                    linked_size = os.stat(dst).st_size
+                    if linked_size != file_size:
+                        os.remove(dst)
+                        raise ChecksumMismatchError(
+                            f"Size mismatch for {os.path.basename(dst)}: expected {file_size}, got {linked_size}"
+                        )
+                if journal:
+                    journal.complete(src, src_stat, cloned=True)
+                return None
+        
+        offset = journal.resume_offset(src, src_stat, part_path) if journal else 0
+        if offset:
+            print(f"Resuming {os.path.basename(src)} at {self._format_size(offset)} / {self._format_size(file_size)}")
+        
+        verifier = StreamVerifier(file_size) if verify else None
+        if verifier and offset:
+            # The resumed prefix never streams through us; hash it from the local .part
+            verifier.seed_from_file(part_path, offset)
+        
+        if journal:
+            # Recorded before the .part is opened, so a cancel knows it's ours to remove
+            journal.update(src, src_stat, offset, part_path)
+        
+        last_offset = [offset]
+        
+        def on_chunk(copied):
+            if journal:
+                journal.update(src, src_stat, copied)
+            callback(src, dst, copied, file_size)
+            if throttle:
+                throttle(copied - last_offset[0])
+            last_offset[0] = copied
+        
+        # Unbuffered handles: every copy path works on raw fds.
+        # FUSE sources get the adaptive readahead pipeline, local ones the kernel paths.
+        with open(src, 'rb', buffering=0) as fsrc:
+            with open(part_path, 'r+b' if offset else 'wb', buffering=0) as fdst:
+                if offset:
+                    # Drop anything past the checkpoint and count the resumed bytes as copied
+                    fdst.truncate(offset)
+                    callback(src, dst, offset, file_size)
+                
+                # Report progress for every chunk, whichever path does the copy
+                method = copy_fd(
+                    fsrc.fileno(),
+                    fdst.fileno(),
+                    on_chunk=on_chunk,
+                    offset=offset,
+                    methods=methods_for_source(src, backend),
+                    on_data=verifier.update if verifier else None
+                )
+        
+        digest = None
+        if verifier:
+            try:
+                verifier.verify_copy(part_path)
+            except ChecksumMismatchError:
+                # Don't resume from corrupt data
+                os.remove(part_path)
+                if journal:
+                    journal.update(src, src_stat, 0)
+                    journal.flush()
+                raise
+            digest = verifier.digest
+        
+        # Move into place, then copy file metadata after content
+        os.replace(part_path, dst)
+        shutil.copystat(src, dst)
+        if journal:
+            journal.complete(src, src_stat, digest)
+        if cloner:
+            cloner.record("copy", streamed_with=method)
+        return digest
     
+    def _clone_file(self, src: str, dst: str, part_path: str, src_stat: os.stat_result,
+                    cloner: FileCloner) -> Optional[str]:
+        """Reflink or hard link `src` into place via `part_path`. Returns the method, or None."""
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            # Hard linked by an earlier attempt
+            cloner.record("hardlink")
+            return "hardlink"
+        method = cloner.clone(src, part_path)
+        if not method:
+            return None
+        os.replace(part_path, dst)
+        if method == "reflink":
+            # A hard link shares the source's inode, so only clones need metadata
+            shutil.copystat(src, dst)
+        return method
+    
+    def _refresh_storage_stats(self, db: Session, job: CopyJob, duration: float):
+        """Post-copy hook: keep the dashboard's storage stats live."""
+        if self.scanner:
+            print(f"Job {job.id}: Triggering post-copy stats update...")
+            self.scanner.update_storage_stats(db)
+
     def _send_discord_notification(self, db: Session, job: CopyJob, duration: float):
         """Send Discord notification for job status change."""
         try:
@@ -369,7 +1122,6 @@ class CopyWorker:
             discord_notifier.set_webhook_url(webhook_url)
             
             # Run async notification in thread-safe way
-            import asyncio
             loop = getattr(self.websocket_manager, '_loop', None)
             if loop and loop.is_running():
                 asyncio.run_coroutine_threadsafe(
@@ -417,16 +1169,25 @@ class CopyWorker:
                     "copied_size_bytes": job.copied_size_bytes,
                     "total_size_bytes": job.total_size_bytes
                 }
+                # Running jobs report their live (not yet flushed) values
+                live = progress_registry.get(job.id) if job.status == "processing" else None
+                if live:
+                    progress_data["progress_percent"] = live["progress_percent"]
+                    progress_data["copied_size_bytes"] = live["copied_size_bytes"]
+                    # Server-side speed telemetry so every client shows the same numbers
+                    progress_data["speed_bps"] = live["speed_bps"]
+                    progress_data["speed_avg_bps"] = live["speed_avg_bps"]
+                    progress_data["speed_ewma_bps"] = live["speed_ewma_bps"]
+                    progress_data["eta_seconds"] = live["eta_seconds"]
                 
                 # Use asyncio.run_coroutine_threadsafe to call async function from thread
-                import asyncio
                 loop = getattr(self.websocket_manager, '_loop', None)
                 if loop and loop.is_running():
                     asyncio.run_coroutine_threadsafe(
                         self.websocket_manager.broadcast_progress(progress_data),
                         loop
                     )
-                    print(f"WebSocket broadcast: Job {job.id} - {job.progress_percent}% ({self._format_size(job.copied_size_bytes)} / {self._format_size(job.total_size_bytes)})")
+                    print(f"WebSocket broadcast: Job {job.id} - {progress_data['progress_percent']}% ({self._format_size(progress_data['copied_size_bytes'])} / {self._format_size(job.total_size_bytes)})")
                 else:
                     # Fallback if no event loop available
                     print(f"Warning: No active event loop for WebSocket. Progress: Job {job.id} - {job.progress_percent}%")
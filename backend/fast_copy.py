@@ -0,0 +1,477 @@
+"""
+Low-level file copy paths used by the copy worker.
+
+The fastest available path is tried first:
+1. os.copy_file_range - kernel copies the data, no userspace buffers at all
+2. os.sendfile        - kernel copies from the page cache into the destination
+3. readinto           - userspace loop reusing a single preallocated buffer
+
+High-latency FUSE sources (rclone/Zurg) use a fourth path instead:
+4. readahead          - a reader thread fills a bounded double buffer while
+                        the caller writes, with the read size adapted to
+                        the measured throughput
+
+A fifth path, mmap (the source is mapped in windows and written straight
+from the mapping), is only used when a job asks for it. Jobs pick a transfer
+backend (TRANSFER_BACKENDS), a named list of these paths; "auto" chooses by
+source filesystem as above.
+
+Each path reports progress after every chunk through an `on_chunk(copied)`
+callback, so cancellation and progress work the same whichever path runs.
+The userspace paths can also hand each buffer to an `on_data(offset, view)`
+hook before writing it (used for streaming checksums).
+
+When source and destination are on the same filesystem no data needs to
+move at all: a FileCloner tries a reflink clone (FICLONE, copy-on-write
+extents shared on btrfs/XFS/bcachefs) and then a hard link before the
+caller falls back to streaming.
+"""
+import errno
+import mmap
+import os
+import queue
+import re
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+try:
+    import fcntl  # Not available on Windows
+except ImportError:
+    fcntl = None
+
+COPY_CHUNK_SIZE = 1024 * 1024  # 1MB per syscall / progress tick
+
+COPY_METHODS = ("copy_file_range", "sendfile", "readinto")
+FUSE_COPY_METHODS = ("readahead",)
+DATA_METHODS = ("readinto", "readahead", "mmap")  # Paths where the data passes through our buffers
+
+# Transfer backends selectable per job: paths tried in order (None = by source filesystem)
+TRANSFER_BACKENDS = {
+    "auto": None,
+    "kernel": COPY_METHODS,
+    "blocking": ("readinto",),
+    "pipelined": ("readahead",),
+    "mmap": ("mmap", "readinto"),
+}
+DEFAULT_TRANSFER_BACKEND = "auto"
+MMAP_WINDOW_SIZE = 64 * 1024 * 1024  # Mapped at a time, so RSS stays bounded on huge files
+
+# Adaptive read sizes for the readahead path
+ADAPTIVE_MIN_CHUNK = 1024 * 1024        # 1MB
+ADAPTIVE_INITIAL_CHUNK = 4 * 1024 * 1024  # 4MB
+ADAPTIVE_MAX_CHUNK = 16 * 1024 * 1024  # 16MB (x2 buffers per stream)
+READAHEAD_BUFFERS = 2  # Double buffer: one being written while the next is read
+
+# Errors meaning "this kernel path can't handle these two files", not a real I/O failure
+_FALLBACK_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP,
+    errno.EBADF, errno.EPERM, errno.ENOTSOCK, errno.ETXTBSY, errno.EIO,
+}
+
+
+class UnsupportedCopyPath(Exception):
+    """Raised when a copy path isn't usable; `offset` is how far it got."""
+
+    def __init__(self, offset: int):
+        super().__init__(f"copy path unsupported at offset {offset}")
+        self.offset = offset
+
+
+def copy_with_copy_file_range(src_fd: int, dst_fd: int, offset: int, on_chunk: Callable[[int], None],
+                              chunk_size: int = COPY_CHUNK_SIZE, on_data=None) -> int:
+    """Copy from `offset` to EOF with copy_file_range. Returns the final offset."""
+    if not hasattr(os, "copy_file_range"):
+        raise UnsupportedCopyPath(offset)
+
+    start = offset
+    while True:
+        try:
+            copied = os.copy_file_range(src_fd, dst_fd, chunk_size, offset, offset)
+        except OSError as e:
+            if e.errno in _FALLBACK_ERRNOS:
+                raise UnsupportedCopyPath(offset) from e
+            raise
+        if copied == 0:
+            # Some virtual filesystems report 0 instead of failing; treat a
+            # zero-length first call on a non-empty file as unsupported.
+            if offset == start and os.fstat(src_fd).st_size > start:
+                raise UnsupportedCopyPath(offset)
+            return offset
+        offset += copied
+        on_chunk(offset)
+
+
+def copy_with_sendfile(src_fd: int, dst_fd: int, offset: int, on_chunk: Callable[[int], None],
+                       chunk_size: int = COPY_CHUNK_SIZE, on_data=None) -> int:
+    """Copy from `offset` to EOF with sendfile. Returns the final offset."""
+    if not hasattr(os, "sendfile"):
+        raise UnsupportedCopyPath(offset)
+
+    # sendfile writes at the destination's current position
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    start = offset
+    while True:
+        try:
+            sent = os.sendfile(dst_fd, src_fd, offset, chunk_size)
+        except OSError as e:
+            if e.errno in _FALLBACK_ERRNOS:
+                raise UnsupportedCopyPath(offset) from e
+            raise
+        if sent == 0:
+            if offset == start and os.fstat(src_fd).st_size > start:
+                raise UnsupportedCopyPath(offset)
+            return offset
+        offset += sent
+        on_chunk(offset)
+
+
+def copy_with_readinto(src_fd: int, dst_fd: int, offset: int, on_chunk: Callable[[int], None],
+                       chunk_size: int = COPY_CHUNK_SIZE, on_data=None) -> int:
+    """Copy from `offset` to EOF through one reused buffer. Returns the final offset."""
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    while True:
+        # readv fills the preallocated buffer in place (readinto on a raw fd)
+        read = os.readv(src_fd, [buffer])
+        if read == 0:
+            return offset
+        if on_data:
+            on_data(offset, view[:read])
+        written = 0
+        while written < read:
+            written += os.write(dst_fd, view[written:read])
+        offset += read
+        on_chunk(offset)
+
+
+def copy_with_mmap(src_fd: int, dst_fd: int, offset: int, on_chunk: Callable[[int], None],
+                   chunk_size: int = COPY_CHUNK_SIZE, on_data=None,
+                   window_size: int = MMAP_WINDOW_SIZE) -> int:
+    """
+    Copy from `offset` to EOF by mapping the source in windows and writing
+    from the mapping (no read() copies into our buffers). Returns the final offset.
+    """
+    size = os.fstat(src_fd).st_size
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    while offset < size:
+        # Mappings must start on an allocation boundary
+        map_start = offset - offset % mmap.ALLOCATIONGRANULARITY
+        length = min(window_size, size - map_start)
+        try:
+            mapping = mmap.mmap(src_fd, length, access=mmap.ACCESS_READ, offset=map_start)
+        except (OSError, ValueError) as e:
+            # e.g. ENODEV on filesystems without mmap support
+            raise UnsupportedCopyPath(offset) from e
+        try:
+            if hasattr(mapping, "madvise"):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mapping)
+            try:
+                position = offset - map_start
+                while position < length:
+                    end = min(position + chunk_size, length)
+                    chunk = view[position:end]
+                    if on_data:
+                        on_data(offset, chunk)
+                    written = 0
+                    while written < len(chunk):
+                        written += os.write(dst_fd, chunk[written:])
+                    chunk.release()
+                    offset += end - position
+                    position = end
+                    on_chunk(offset)
+            finally:
+                view.release()
+        finally:
+            mapping.close()
+    return offset
+
+
+class AdaptiveChunkSizer:
+    """
+    Picks the read size for a high-latency source by hill climbing on measured
+    throughput: keep doubling (or halving) while throughput improves, turn
+    around when it drops, and never let a single read take longer than
+    `max_read_seconds` so progress and cancellation stay responsive.
+    """
+
+    def __init__(self, min_size: int = ADAPTIVE_MIN_CHUNK, max_size: int = ADAPTIVE_MAX_CHUNK,
+                 initial_size: int = ADAPTIVE_INITIAL_CHUNK, samples_per_step: int = 3,
+                 max_read_seconds: float = 2.0):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.size = max(min_size, min(initial_size, max_size))
+        self.samples_per_step = samples_per_step
+        self.max_read_seconds = max_read_seconds
+        self._direction = 1  # 1 = growing, -1 = shrinking
+        self._previous_rate = 0.0
+        self._bytes = 0
+        self._seconds = 0.0
+        self._samples = 0
+
+    def record(self, nbytes: int, seconds: float):
+        """Record one read of `nbytes` that took `seconds`."""
+        if seconds > self.max_read_seconds and self.size > self.min_size:
+            # Reads are getting too slow to report on; back off right away
+            self._step(-1)
+            return
+
+        self._bytes += nbytes
+        self._seconds += max(seconds, 1e-6)
+        self._samples += 1
+        if self._samples < self.samples_per_step:
+            return
+
+        rate = self._bytes / self._seconds
+        previous = self._previous_rate
+        self._previous_rate = rate
+        if previous == 0 or rate > previous * 1.05:
+            # Still improving, keep going the same way
+            self._step(self._direction)
+        elif rate < previous * 0.95:
+            # Last step made things worse, turn around
+            self._direction = -self._direction
+            self._step(self._direction)
+        else:
+            # Plateau: stay at this size and keep measuring
+            self._reset_samples()
+
+    def _step(self, direction: int):
+        new_size = self.size * 2 if direction > 0 else self.size // 2
+        new_size = max(self.min_size, min(new_size, self.max_size))
+        if new_size == self.size:
+            # Hit a bound, next step goes the other way
+            self._direction = -direction
+        self.size = new_size
+        self._reset_samples()
+
+    def _reset_samples(self):
+        self._bytes = 0
+        self._seconds = 0.0
+        self._samples = 0
+
+
+def copy_with_readahead(src_fd: int, dst_fd: int, offset: int, on_chunk: Callable[[int], None],
+                        sizer: Optional[AdaptiveChunkSizer] = None, on_data=None) -> int:
+    """
+    Copy from `offset` to EOF with a background reader thread, so the next
+    read from the (slow) source overlaps with the current write. Buffers
+    cycle through a bounded pool, capping memory at READAHEAD_BUFFERS reads.
+    Returns the final offset.
+    """
+    sizer = sizer or AdaptiveChunkSizer()
+    free_buffers: "queue.Queue[bytearray]" = queue.Queue()
+    for _ in range(READAHEAD_BUFFERS):
+        free_buffers.put(bytearray(0))
+    filled: "queue.Queue[Tuple[Optional[bytearray], int]]" = queue.Queue(maxsize=READAHEAD_BUFFERS)
+    stop = threading.Event()
+    reader_error = []
+
+    def reader():
+        position = offset
+        try:
+            while not stop.is_set():
+                buffer = free_buffers.get()
+                if buffer is None:
+                    return
+                size = sizer.size
+                if len(buffer) < size:
+                    buffer = bytearray(size)
+                started = time.monotonic()
+                read = os.preadv(src_fd, [memoryview(buffer)[:size]], position)
+                sizer.record(read, time.monotonic() - started)
+                if read == 0:
+                    filled.put((None, 0))
+                    return
+                position += read
+                filled.put((buffer, read))
+        except BaseException as e:
+            reader_error.append(e)
+            filled.put((None, 0))
+
+    thread = threading.Thread(target=reader, daemon=True, name="copy-readahead")
+    thread.start()
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    try:
+        while True:
+            buffer, length = filled.get()
+            if buffer is None:
+                if reader_error:
+                    raise reader_error[0]
+                return offset
+            view = memoryview(buffer)
+            if on_data:
+                on_data(offset, view[:length])
+            written = 0
+            while written < length:
+                written += os.write(dst_fd, view[written:length])
+            view.release()
+            offset += length
+            free_buffers.put(buffer)
+            on_chunk(offset)
+    finally:
+        # Unblock and retire the reader if we're leaving early (error/cancel)
+        stop.set()
+        free_buffers.put(None)
+        while thread.is_alive():
+            try:
+                filled.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
+
+
+_COPY_FUNCTIONS = {
+    "copy_file_range": copy_with_copy_file_range,
+    "sendfile": copy_with_sendfile,
+    "readinto": copy_with_readinto,
+    "readahead": copy_with_readahead,
+    "mmap": copy_with_mmap,
+}
+
+
+# Same-filesystem fast paths, in the order tried
+LINK_MODES = {
+    "auto": ("reflink", "hardlink"),
+    "reflink": ("reflink",),
+    "off": (),
+}
+DEFAULT_LINK_MODE = "auto"
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+
+
+def reflink_file(src: str, dst: str):
+    """Clone `src` to `dst` sharing its data extents (copy-on-write). Raises OSError if unsupported."""
+    if fcntl is None:
+        raise OSError(errno.ENOTSUP, "reflink needs fcntl")
+    with open(src, 'rb', buffering=0) as fsrc:
+        with open(dst, 'wb', buffering=0) as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+
+
+def hardlink_file(src: str, dst: str):
+    """Make `dst` another name for `src` (same inode, no data written)."""
+    os.link(src, dst)
+
+
+_LINK_FUNCTIONS = {
+    "reflink": reflink_file,
+    "hardlink": hardlink_file,
+}
+
+
+class FileCloner:
+    """
+    Same-filesystem fast path for one job. `clone()` tries each method in
+    turn; a method that fails once (EXDEV across bind mounts, EOPNOTSUPP on
+    ext4, EPERM on protected hardlinks...) is dropped for the rest of the job
+    so later files go straight to streaming. `used` counts how each file
+    was transferred, including streamed copies recorded by the caller, and
+    `streamed_with` which copy_fd method moved the data of those copies.
+    """
+
+    def __init__(self, methods: Sequence[str] = ()):
+        self.methods = list(methods)
+        self.used: Counter = Counter()
+        self.streamed_with: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def clone(self, src: str, dst: str) -> Optional[str]:
+        """Create `dst` from `src` without copying data. Returns the method used, or None."""
+        for method in list(self.methods):
+            try:
+                if os.path.lexists(dst):
+                    os.remove(dst)
+                _LINK_FUNCTIONS[method](src, dst)
+            except OSError as e:
+                try:
+                    if method == "reflink" and os.path.lexists(dst):
+                        os.remove(dst)
+                except OSError:
+                    pass
+                with self._lock:
+                    if method in self.methods:
+                        self.methods.remove(method)
+                print(f"{method} not available for {os.path.basename(src)} ({e.strerror or e}), not trying it again for this job")
+                continue
+            self.record(method)
+            return method
+        return None
+
+    def record(self, method: str, streamed_with: Optional[str] = None):
+        with self._lock:
+            self.used[method] += 1
+            if streamed_with:
+                self.streamed_with[streamed_with] += 1
+
+    def summary(self) -> Optional[str]:
+        """How the job's files were transferred, e.g. "reflink" or "hardlink+copy"."""
+        with self._lock:
+            return "+".join(sorted(self.used)) if self.used else None
+
+
+_mount_cache: Dict[str, object] = {"loaded_at": 0.0, "mounts": []}
+
+
+def _load_mounts():
+    """Return [(mount_point, fstype)] sorted longest mount point first (cached 60s)."""
+    now = time.monotonic()
+    if now - _mount_cache["loaded_at"] < 60 and _mount_cache["mounts"]:
+        return _mount_cache["mounts"]
+    mounts = []
+    try:
+        with open("/proc/self/mounts") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3:
+                    # Spaces etc. in mount points are octal-escaped (\040)
+                    mount_point = re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), parts[1])
+                    mounts.append((mount_point, parts[2]))
+    except OSError:
+        pass
+    mounts.sort(key=lambda m: len(m[0]), reverse=True)
+    _mount_cache["mounts"] = mounts
+    _mount_cache["loaded_at"] = now
+    return mounts
+
+
+def is_fuse_path(path: str) -> bool:
+    """True if `path` lives on a FUSE mount (rclone, Zurg, ...)."""
+    path = os.path.abspath(path)
+    for mount_point, fstype in _load_mounts():
+        if path == mount_point or path.startswith(mount_point.rstrip("/") + "/"):
+            return fstype.startswith("fuse")
+    return False
+
+
+def methods_for_source(path: str, backend: Optional[str] = None) -> Sequence[str]:
+    """Pick the copy methods to try for a source file (a job's backend overrides the default)."""
+    methods = TRANSFER_BACKENDS.get(backend or DEFAULT_TRANSFER_BACKEND)
+    if methods:
+        return methods
+    return FUSE_COPY_METHODS if is_fuse_path(path) else COPY_METHODS
+
+
+def copy_fd(src_fd: int, dst_fd: int, on_chunk: Optional[Callable[[int], None]] = None,
+            offset: int = 0, methods: Sequence[str] = COPY_METHODS,
+            on_data: Optional[Callable[[int, memoryview], None]] = None) -> str:
+    """
+    Copy src_fd to dst_fd starting at `offset`, trying `methods` in order.
+    If a kernel path gives up part way, the next method resumes from where
+    it stopped. With `on_data`, only paths that see the data are used.
+    Returns the name of the method that finished the copy.
+    """
+    on_chunk = on_chunk or (lambda copied: None)
+    if on_data:
+        methods = [m for m in methods if m in DATA_METHODS] or ["readinto"]
+    for method in methods:
+        try:
+            _COPY_FUNCTIONS[method](src_fd, dst_fd, offset, on_chunk, on_data=on_data)
+            return method
+        except UnsupportedCopyPath as e:
+            offset = e.offset
+    raise OSError(errno.ENOTSUP, f"No usable copy method among {list(methods)}")
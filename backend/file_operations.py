@@ -1,5 +1,6 @@
 import os
 import shutil
+from array import array
 from typing import List, Dict
 
 
@@ -28,6 +29,16 @@ def format_size(bytes_size: int) -> str:
     return f"{bytes_size:.2f} PB"
 
 
+def get_mount_path(source: str) -> str:
+    """Base path of the source or destination mount.
+    
+    SOURCE_MOUNT / DESTINATION_MOUNT, overridden by the deprecated ZURG_BASE / HARDDRIVE_BASE if set.
+    """
+    if source in ("source", "zurg"):
+        return os.getenv("ZURG_BASE") or os.getenv("SOURCE_MOUNT", "/mnt/source")
+    return os.getenv("HARDDRIVE_BASE") or os.getenv("DESTINATION_MOUNT", "/mnt/destination")
+
+
 def validate_path(path: str, base_path: str) -> bool:
     """Validate that the path is within the base path (prevent directory traversal)."""
     try:
@@ -60,24 +71,122 @@ def list_directory(
     Returns:
         Dictionary with 'items', 'total', 'has_more' keys
     """
+    items = scan_directory(base_path, relative_path)
+    return paginate_listing(items, limit=limit, offset=offset, sort_by=sort_by, order=order)
+
+
+class DirectoryListing:
+    """Compact, sortable snapshot of one directory.
+    
+    Entries are stored as parallel columns (names, sizes, mtimes and a bitmap
+    of which entries are folders) instead of one dict per entry. Sort
+    orders for name, size and modified are computed once when the listing is
+    built, folders first, so any page in any order is a slice of an index
+    array. Dicts are only built for the entries on the requested page.
+    """
+    
+    SORT_FIELDS = ("name", "size", "modified")
+    
+    def __init__(self, relative_path: str, names: List[str], sizes: array, mtimes: array, dirs: bytearray):
+        self.relative_path = relative_path
+        self.names = names
+        self.sizes = sizes
+        self.mtimes = mtimes
+        self.dirs = dirs  # bit i set = entry i is a folder
+        self.dir_count = sum(1 for i in range(len(names)) if self.is_directory(i))
+        self._orders: Dict[str, array] = {}
+        for field in self.SORT_FIELDS:
+            self._orders[field] = self._sort_order(field)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def is_directory(self, index: int) -> bool:
+        return bool(self.dirs[index >> 3] & (1 << (index & 7)))
+    
+    def _sort_order(self, field: str) -> array:
+        """Entry indexes sorted ascending by `field`, folders before files."""
+        if field == "name":
+            lowered = [name.lower() for name in self.names]
+            key = lowered.__getitem__
+        elif field == "size":
+            key = self.sizes.__getitem__
+        else:
+            key = self.mtimes.__getitem__
+        folders = sorted((i for i in range(len(self)) if self.is_directory(i)), key=key)
+        files = sorted((i for i in range(len(self)) if not self.is_directory(i)), key=key)
+        return array('I', folders + files)
+    
+    def page_indexes(self, offset: int, limit: int = None, sort_by: str = "modified", order: str = "desc") -> List[int]:
+        """Entry indexes for one page; folders stay first in both directions."""
+        total = len(self)
+        stop = total if limit is None else min(total, offset + limit)
+        positions = range(max(offset, 0), stop)
+        ascending = self._orders.get(sort_by)
+        if ascending is None:
+            # Unknown field: scan order, folders first (as before)
+            ascending = array('I', [i for i in range(total) if self.is_directory(i)] +
+                                   [i for i in range(total) if not self.is_directory(i)])
+            return [ascending[p] for p in positions]
+        if order != "desc":
+            return [ascending[p] for p in positions]
+        # Descending: walk each group (folders, then files) backwards
+        dir_count = self.dir_count
+        return [
+            ascending[dir_count - 1 - p] if p < dir_count else ascending[total - 1 - (p - dir_count)]
+            for p in positions
+        ]
+    
+    def item(self, index: int) -> Dict:
+        """The API dict for one entry."""
+        name = self.names[index]
+        is_dir = self.is_directory(index)
+        size = self.sizes[index]
+        return {
+            "name": name,
+            "path": os.path.join(self.relative_path, name).replace('\\', '/'),
+            "is_directory": is_dir,
+            "size": size,
+            "size_formatted": format_size(size) if not is_dir else "—",
+            "modified": self.mtimes[index]
+        }
+    
+    def approximate_size(self) -> int:
+        """Rough in-memory size in bytes (name strings, columns and sort orders)."""
+        count = len(self)
+        return sum(49 + len(name) for name in self.names) + count * (8 + 8 + 8 + 3 * 4) + len(self.dirs)
+    
+    @classmethod
+    def empty(cls, relative_path: str = "") -> "DirectoryListing":
+        return cls(relative_path, [], array('q'), array('d'), bytearray())
+
+
+def scan_directory(base_path: str, relative_path: str = "") -> DirectoryListing:
+    """Read every entry of a directory. This is the only part of browsing that touches the disk.
+    
+    Returns an empty listing for invalid, missing or unreadable directories.
+    """
     # Normalize path to prevent directory traversal
     relative_path = relative_path.lstrip('/').replace('\\', '/')
     if '..' in relative_path or relative_path.startswith('/'):
-        return {"items": [], "total": 0, "has_more": False}
+        return DirectoryListing.empty(relative_path)
     
     full_path = os.path.normpath(os.path.join(base_path, relative_path))
     
     # Security check: ensure we're still within base_path
     if not full_path.startswith(os.path.abspath(base_path)):
-        return {"items": [], "total": 0, "has_more": False}
+        return DirectoryListing.empty(relative_path)
     
     if not os.path.exists(full_path):
-        return {"items": [], "total": 0, "has_more": False}
+        return DirectoryListing.empty(relative_path)
     
     if not os.path.isdir(full_path):
-        return {"items": [], "total": 0, "has_more": False}
+        return DirectoryListing.empty(relative_path)
     
-    all_items = []
+    names: List[str] = []
+    sizes = array('q')
+    mtimes = array('d')
+    dir_flags: List[bool] = []
     
     try:
         # Use scandir for better performance (one syscall for iter + stat)
@@ -88,105 +197,45 @@ def list_directory(
                     # Stat the entry to get size/mtime
                     # scandir caches stat on Windows usually, or on Linux
                     stat = entry.stat()
-                    
-                    size = 0
-                    if not is_dir:
-                        size = stat.st_size
-                    
-                    modified = stat.st_mtime
-                    
-                    # Prepare item dict (lightweight for sorting)
-                    all_items.append({
-                        "name": entry.name,
-                        "path": os.path.join(relative_path, entry.name).replace('\\', '/'),
-                        "is_directory": is_dir,
-                        "size": size,
-                        "size_formatted": format_size(size) if not is_dir else "—",
-                        "modified": modified
-                    })
-                    
                 except (OSError, PermissionError):
                     # Skip problematic files
                     continue
+                names.append(entry.name)
+                sizes.append(0 if is_dir else stat.st_size)
+                mtimes.append(stat.st_mtime)
+                dir_flags.append(is_dir)
                     
-        # SORTING LOGIC
-        reverse = (order == "desc")
-        
-        def sort_key(item):
-            # Directories always on top? Or mixed?
-            # Standard explorer: folders first, then files.
-            # Within that: sort by field.
-            
-            # Primary sort: Directory vs File (Folders always first)
-            # 0 for dir, 1 for file
-            type_score = 0 if item["is_directory"] else 1
-            
-            # Secondary sort: value
-            val = item.get(sort_by)
-            
-            if sort_by == 'name':
-                val = item['name'].lower()
-            elif sort_by == 'modified':
-                 val = item['modified']
-            elif sort_by == 'size':
-                 val = item['size']
-            
-            # If we are sorting DESC, we want larger values first.
-            # But we want Folders on top regardless of ascending/descending usually?
-            # Let's keep folders on top always.
-            return (type_score, val if not reverse else -val if isinstance(val, (int, float)) else val)
-
-        # Better Sort Strategy:
-        # Separately sort folders and files, then merge?
-        # Or just use a complex key.
-        
-        # Simple Logic:
-        # 1. Separate Folders and Files
-        folders = [x for x in all_items if x["is_directory"]]
-        files = [x for x in all_items if not x["is_directory"]]
-        
-        # 2. Sort each group
-        if sort_by == 'name':
-             if reverse:
-                 folders.sort(key=lambda x: x['name'].lower(), reverse=True)
-                 files.sort(key=lambda x: x['name'].lower(), reverse=True)
-             else:
-                 folders.sort(key=lambda x: x['name'].lower())
-                 files.sort(key=lambda x: x['name'].lower())
-                 
-        elif sort_by == 'modified':
-             # Date: Defaults to DESC usually
-             folders.sort(key=lambda x: x['modified'], reverse=reverse)
-             files.sort(key=lambda x: x['modified'], reverse=reverse)
-             
-        elif sort_by == 'size':
-             folders.sort(key=lambda x: x['size'], reverse=reverse)
-             files.sort(key=lambda x: x['size'], reverse=reverse)
-        
-        # 3. Merge (Folders always first)
-        all_items_sorted = folders + files
-        
-        total_count = len(all_items_sorted)
-        
-        # Apply pagination
-        if limit is not None:
-            result_items = all_items_sorted[offset:offset + limit]
-        else:
-            result_items = all_items_sorted[offset:]
-            
     except PermissionError:
-        result_items = []
-        total_count = 0
+        return DirectoryListing.empty(relative_path)
     
+    dirs = bytearray((len(names) + 7) // 8)
+    for i, is_dir in enumerate(dir_flags):
+        if is_dir:
+            dirs[i >> 3] |= 1 << (i & 7)
+    return DirectoryListing(relative_path, names, sizes, mtimes, dirs)
+
+
+def paginate_listing(
+    listing: DirectoryListing,
+    limit: int = None,
+    offset: int = 0,
+    sort_by: str = "modified",
+    order: str = "desc"
+) -> Dict:
+    """Sort and page a listing from scan_directory (in memory, never touches the disk).
+    
+    Returns:
+        Dictionary with 'items', 'total', 'has_more' keys
+    """
+    total_count = len(listing)
+    result_items = [listing.item(i) for i in listing.page_indexes(offset, limit, sort_by, order)]
     has_more = limit is not None and (offset + limit) < total_count
     
-    result = {
+    return {
         "items": result_items,
         "total": total_count,
         "has_more": has_more
     }
-    
-    return result
 
 
 def get_folder_info(base_path: str, relative_path: str, calculate_size: bool = False) -> Dict:
@@ -0,0 +1,211 @@
+"""
+Persistent recursive folder sizes.
+
+The periodic storage stats walk records every directory it visits in the
+folder_sizes table with the size of the files directly inside it, and
+rolls those up bottom-up into recursive totals. /api/folder-info then
+answers a folder's size with one row lookup instead of walking it.
+
+Refreshes are incremental: a directory whose mtime hasn't changed since it
+was last read still has the same entries, so its stored file sizes and
+subdirectories are reused and only its subdirectories are stat'ed. Files
+that change size in place don't touch the directory mtime, and some FUSE
+mounts don't keep directory mtimes at all, so every FULL_REFRESH_HOURS each
+tree is re-read completely.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from file_operations import get_mount_path
+from models import FolderSize
+
+FULL_REFRESH_HOURS = 24.0
+
+_refresh_lock = threading.Lock()  # One refresh writes to folder_sizes at a time
+_last_full_refresh: Dict[tuple, float] = {}  # (source, root) -> time.monotonic()
+
+
+def _parent(path: str) -> str:
+    return path.rsplit('/', 1)[0] if '/' in path else ''
+
+
+def _totals(row: FolderSize) -> Dict:
+    return {
+        "size": row.total_size,
+        "files": row.file_count,
+        "folders": row.folder_count,
+        "indexed_at": row.updated_at,
+    }
+
+
+def refresh(db: Session, source: str, base_path: str, relative_path: str = "",
+            full: Optional[bool] = None) -> Optional[Dict]:
+    """
+    Bring the index for one directory tree up to date and return its totals
+    ({"size", "files", "folders", "indexed_at"}), or None if it doesn't exist.
+    `full=None` re-reads everything if the tree's last full refresh is older
+    than FULL_REFRESH_HOURS.
+    """
+    root = relative_path.strip('/')
+    if full is None:
+        last = _last_full_refresh.get((source, root))
+        full = last is None or time.monotonic() - last > FULL_REFRESH_HOURS * 3600
+    with _refresh_lock:
+        return _refresh(db, source, base_path, root, full)
+
+
+def _refresh(db: Session, source: str, base_path: str, root: str, full: bool) -> Optional[Dict]:
+    prefix = root + '/' if root else ''
+    query = db.query(FolderSize).filter(FolderSize.source == source)
+    if root:
+        query = query.filter(or_(FolderSize.path == root, FolderSize.path.like(prefix + '%')))
+    # LIKE treats '_' as a wildcard, so re-check the prefix here
+    stored = {row.path: row for row in query if row.path == root or row.path.startswith(prefix)}
+    old_root = (stored[root].total_size, stored[root].file_count, stored[root].folder_count) if root in stored else (0, 0, 0)
+    children = defaultdict(list)
+    for path in stored:
+        if path != root:
+            children[_parent(path)].append(path)
+
+    seen = set()
+    now = datetime.utcnow()
+
+    def visit(path: str) -> Optional[FolderSize]:
+        full_path = os.path.join(base_path, path) if path else base_path
+        try:
+            mtime = os.stat(full_path).st_mtime
+        except OSError:
+            return None
+        row = stored.get(path)
+        if row is not None and not full and row.mtime == mtime:
+            own_size, own_files, own_folders = row.own_size, row.own_files, row.own_folders
+            subdirs = children[path]
+        else:
+            own_size = own_files = own_folders = 0
+            subdirs = []
+            try:
+                with os.scandir(full_path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir():
+                                own_folders += 1
+                                # Like os.walk: symlinked folders are counted but not followed
+                                if not entry.is_symlink():
+                                    subdirs.append(f"{path}/{entry.name}" if path else entry.name)
+                            else:
+                                own_size += entry.stat().st_size
+                                own_files += 1
+                        except OSError:
+                            # Broken symlink or vanished file
+                            continue
+            except OSError:
+                pass
+
+        total_size, file_count, folder_count = own_size, own_files, own_folders
+        for subdir in subdirs:
+            child = visit(subdir)
+            if child is not None:
+                total_size += child.total_size
+                file_count += child.file_count
+                folder_count += child.folder_count
+
+        if row is None:
+            row = FolderSize(source=source, path=path)
+            db.add(row)
+        values = (mtime, own_size, own_files, own_folders, total_size, file_count, folder_count)
+        if values != (row.mtime, row.own_size, row.own_files, row.own_folders,
+                      row.total_size, row.file_count, row.folder_count):
+            (row.mtime, row.own_size, row.own_files, row.own_folders,
+             row.total_size, row.file_count, row.folder_count) = values
+            row.updated_at = now
+        seen.add(path)
+        return row
+
+    result = visit(root)
+    for path, row in stored.items():
+        if path not in seen:
+            db.delete(row)
+    if result is not None and root:
+        _propagate(db, source, root, result.total_size - old_root[0],
+                   result.file_count - old_root[1], result.folder_count - old_root[2])
+    db.commit()
+    if full:
+        _last_full_refresh[(source, root)] = time.monotonic()
+    return _totals(result) if result is not None else None
+
+
+def _propagate(db: Session, source: str, path: str, size: int, files: int, folders: int):
+    """Apply a subtree's change to the totals of its indexed ancestors."""
+    if not (size or files or folders):
+        return
+    while path:
+        path = _parent(path)
+        row = db.query(FolderSize).filter(FolderSize.source == source, FolderSize.path == path).first()
+        if row is None:
+            continue
+        row.total_size += size
+        row.file_count += files
+        row.folder_count += folders
+
+
+def _locate(full_path: str):
+    """(source, relative path) candidates for an absolute path under either mount."""
+    full_path = os.path.normpath(full_path)
+    for source in ("source", "destination"):
+        base = os.path.normpath(get_mount_path(source))
+        if full_path == base or full_path.startswith(base + os.sep):
+            yield source, full_path[len(base):].strip(os.sep).replace(os.sep, '/')
+
+
+def indexed_size(db: Session, full_path: str) -> Optional[int]:
+    """Recorded recursive size of an absolute path under either mount, without touching the disk."""
+    for source, path in _locate(full_path):
+        row = db.query(FolderSize.total_size).filter(
+            FolderSize.source == source, FolderSize.path == path
+        ).first()
+        if row is not None:
+            return row.total_size
+    return None
+
+
+def current_size(db: Session, full_path: str) -> Optional[int]:
+    """
+    Recursive size of an already indexed folder under either mount, after an
+    incremental refresh (every subdirectory is stat'ed, only changed ones are
+    re-read). None if it isn't indexed or a refresh is already running.
+    """
+    for source, path in _locate(full_path):
+        if db.query(FolderSize.path).filter(FolderSize.source == source, FolderSize.path == path).first() is None:
+            continue
+        if _refresh_lock.locked():
+            return None
+        totals = refresh(db, source, get_mount_path(source), path, full=False)
+        return totals["size"] if totals else None
+    return None
+
+
+def get_folder_size(db: Session, source: str, base_path: str, relative_path: str) -> Optional[Dict]:
+    """
+    Recursive totals for one folder from the index. A folder that isn't indexed
+    yet, or whose own mtime changed, is refreshed first (incrementally).
+    """
+    path = relative_path.strip('/')
+    row = db.query(FolderSize).filter(FolderSize.source == source, FolderSize.path == path).first()
+    if row is not None:
+        try:
+            current = os.stat(os.path.join(base_path, path) if path else base_path).st_mtime
+        except OSError:
+            return None
+        if current == row.mtime:
+            return _totals(row)
+        if _refresh_lock.locked():
+            # A refresh is running; answer from the index now rather than wait for it
+            return _totals(row)
+    return refresh(db, source, base_path, path, full=False)
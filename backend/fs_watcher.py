@@ -0,0 +1,208 @@
+"""
+Change notifications for cached destination listings.
+
+The browse cache registers every destination directory it lists here. On
+Linux the watcher uses inotify (through ctypes, no extra dependency) and
+reports a directory as changed as soon as an entry in it is created,
+deleted, moved, finished writing or has its attributes changed. Elsewhere,
+or if inotify can't be set up, it polls the mtime of each watched
+directory every POLL_INTERVAL seconds instead, which catches entries being
+added, removed or renamed.
+
+A change to a directory's entries also changes that directory's mtime as
+shown in its parent's listing, so the parent is reported too.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+POLL_INTERVAL = 2.0   # Seconds between mtime checks in polling mode
+MAX_WATCHES = 4096    # Oldest watched directories are dropped past this
+
+# inotify(7) event bits
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+ENTRY_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+WATCH_MASK = ENTRY_EVENTS | IN_CLOSE_WRITE | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+def _load_inotify():
+    """libc with the inotify calls, or None where they aren't available."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class DirectoryWatcher:
+    """Watches individual directories under `base_path` and calls `on_change(relative_dir)`."""
+
+    def __init__(self, base_path: str, on_change: Callable[[str], None]):
+        self.base_path = os.path.abspath(base_path)
+        self.on_change = on_change
+        self.mode: Optional[str] = None  # "inotify" or "polling" once started
+        self._lock = threading.Lock()
+        self._watched: "OrderedDict[str, int]" = OrderedDict()  # relative dir -> wd (inotify) or mtime_ns (polling)
+        self._wd_paths: Dict[int, str] = {}
+        self._libc = None
+        self._fd: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._libc = _load_inotify()
+        if self._libc:
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+            else:
+                print(f"inotify unavailable ({os.strerror(ctypes.get_errno())}), polling {self.base_path} instead")
+        self.mode = "inotify" if self._fd is not None else "polling"
+        self._thread = threading.Thread(
+            target=self._inotify_loop if self._fd is not None else self._poll_loop,
+            daemon=True, name="fs-watcher",
+        )
+        self._thread.start()
+        print(f"Watching {self.base_path} for changes ({self.mode})")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=POLL_INTERVAL + 1)
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        with self._lock:
+            self._watched.clear()
+            self._wd_paths.clear()
+
+    def watch(self, relative_dir: str) -> bool:
+        """
+        Start reporting changes to one directory. Returns False if it can't be
+        watched (watcher not started, the directory is gone, or inotify refused
+        it, e.g. past the fs.inotify.max_user_watches limit).
+        """
+        if not self.running:
+            return False
+        relative_dir = relative_dir.strip('/')
+        full_path = os.path.join(self.base_path, relative_dir)
+        with self._lock:
+            if relative_dir in self._watched:
+                self._watched.move_to_end(relative_dir)
+                return True
+            if self._fd is not None:
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(full_path), WATCH_MASK)
+                if wd < 0:
+                    return False
+                self._wd_paths[wd] = relative_dir
+                self._watched[relative_dir] = wd
+            else:
+                try:
+                    self._watched[relative_dir] = os.stat(full_path).st_mtime_ns
+                except OSError:
+                    return False
+            while len(self._watched) > MAX_WATCHES:
+                dropped, wd = self._watched.popitem(last=False)
+                self._forget(dropped, wd)
+                # Its cached listing would no longer be kept up to date
+                self._notify_later(dropped)
+        return True
+
+    def _forget(self, relative_dir: str, wd: int):
+        """Stop watching (caller holds the lock)."""
+        if self._fd is not None:
+            self._wd_paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _notify_later(self, relative_dir: str):
+        threading.Thread(target=self._notify, args=(relative_dir, False), daemon=True).start()
+
+    def _notify(self, relative_dir: str, include_parent: bool):
+        changed = [relative_dir]
+        if include_parent and relative_dir:
+            changed.append(os.path.dirname(relative_dir))
+        for path in changed:
+            try:
+                self.on_change(path)
+            except Exception as e:
+                print(f"Error handling change in {path or '/'}: {e}")
+
+    def _inotify_loop(self):
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], 1.0)
+                if not ready:
+                    continue
+                data = os.read(self._fd, 64 * 1024)
+            except (OSError, ValueError, TypeError):
+                if self._stop.is_set():
+                    return
+                continue
+            changed: Dict[str, bool] = {}  # relative dir -> parent affected too
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, name_len = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + name_len
+                if mask & IN_Q_OVERFLOW:
+                    # Events were lost: treat everything watched as changed
+                    with self._lock:
+                        for relative_dir in self._watched:
+                            changed[relative_dir] = True
+                    continue
+                with self._lock:
+                    relative_dir = self._wd_paths.get(wd)
+                    if relative_dir is None:
+                        continue
+                    if mask & IN_IGNORED:
+                        # Directory removed or unmounted; the kernel dropped the watch
+                        self._wd_paths.pop(wd, None)
+                        self._watched.pop(relative_dir, None)
+                changed[relative_dir] = changed.get(relative_dir, False) or bool(
+                    mask & (ENTRY_EVENTS | IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED)
+                )
+            for relative_dir, include_parent in changed.items():
+                self._notify(relative_dir, include_parent)
+
+    def _poll_loop(self):
+        while not self._stop.wait(POLL_INTERVAL):
+            with self._lock:
+                watched = list(self._watched.items())
+            for relative_dir, mtime_ns in watched:
+                try:
+                    current = os.stat(os.path.join(self.base_path, relative_dir)).st_mtime_ns
+                except OSError:
+                    current = None
+                if current == mtime_ns:
+                    continue
+                with self._lock:
+                    if current is None:
+                        self._watched.pop(relative_dir, None)
+                    elif relative_dir in self._watched:
+                        self._watched[relative_dir] = current
+                self._notify(relative_dir, True)
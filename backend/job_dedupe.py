@@ -0,0 +1,80 @@
+"""
+Copy job deduplication.
+
+A request to copy a source to a destination that is already queued, held or
+copying attaches to that job instead of creating a second one, and a copy
+that completed recently (and whose source hasn't changed since) isn't
+repeated. Lookups go through the (source_path, destination_path) index on
+copy_jobs. Callers hold `enqueue_lock` from the lookup until the new job is
+committed, so two identical requests arriving together can't both miss.
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from models import CopyJob, SystemSettings
+from space_admission import HELD_STATUS
+
+ACTIVE_STATUSES = ("queued", HELD_STATUS, "processing")
+DEFAULT_DEDUPE_WINDOW_HOURS = 24.0  # Completed copies younger than this aren't repeated
+
+enqueue_lock = threading.Lock()
+
+
+def job_key(source_path: str, destination_path: str):
+    """(source, destination) as stored on copy_jobs."""
+    return (
+        os.path.normpath(source_path).replace('\\', '/'),
+        os.path.normpath(destination_path).replace('\\', '/'),
+    )
+
+
+def get_dedupe_window(db: Session) -> timedelta:
+    setting = db.query(SystemSettings).filter(SystemSettings.key == "copy_dedupe_window_hours").first()
+    try:
+        hours = float(setting.value) if setting and setting.value else DEFAULT_DEDUPE_WINDOW_HOURS
+    except ValueError:
+        hours = DEFAULT_DEDUPE_WINDOW_HOURS
+    return timedelta(hours=max(0.0, hours))
+
+
+def _unchanged_since(job: CopyJob) -> bool:
+    """True if the completed copy is still in place and the source wasn't modified after it."""
+    if not job.completed_at or not os.path.exists(job.destination_path):
+        return False
+    try:
+        source_mtime = datetime.utcfromtimestamp(os.path.getmtime(job.source_path))
+    except OSError:
+        return False
+    return source_mtime <= job.completed_at
+
+
+def find_existing_job(db: Session, source_path: str, destination_path: str,
+                      sync_mode: Optional[str] = None) -> Optional[CopyJob]:
+    """
+    The job an identical request should attach to: an active job for the same
+    (source, destination), else a recent unchanged completed one. Sync requests
+    only attach to active jobs, since asking for a sync means "check again".
+    """
+    source, destination = job_key(source_path, destination_path)
+    candidates = db.query(CopyJob).filter(
+        CopyJob.source_path == source,
+        CopyJob.destination_path == destination,
+        CopyJob.status.in_(ACTIVE_STATUSES + ("completed",)),
+    ).order_by(CopyJob.created_at.desc()).all()
+
+    for job in candidates:
+        if job.status in ACTIVE_STATUSES:
+            return job
+
+    window = get_dedupe_window(db)
+    if sync_mode or not window:
+        return None
+    cutoff = datetime.utcnow() - window
+    for job in candidates:
+        if job.completed_at and job.completed_at >= cutoff and _unchanged_since(job):
+            return job
+    return None
@@ -17,8 +17,29 @@ from auth import (
     verify_password,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
-from file_operations import list_directory, get_folder_info, format_size
-from copy_worker import copy_worker
+from file_operations import scan_directory, paginate_listing, get_folder_info, format_size, get_mount_path, get_directory_size
+from cache import browse_key, get_cache
+from fs_watcher import DirectoryWatcher
+from folder_index import get_folder_size
+from copy_worker import (
+    copy_worker,
+    DEFAULT_MAX_CONCURRENT_JOBS,
+    DEFAULT_MAX_JOBS_PER_SOURCE,
+    DEFAULT_MAX_JOBS_PER_DESTINATION,
+    DEFAULT_STREAMS_PER_JOB,
+    DEFAULT_PREEMPT_PRIORITY_GAP,
+    MAX_STREAMS_PER_JOB,
+    SYNC_MODES
+)
+from copy_journal import CopyJournal, journal_path
+from job_dedupe import DEFAULT_DEDUPE_WINDOW_HOURS, enqueue_lock, find_existing_job, job_key
+from progress_registry import progress_registry
+from fast_copy import DEFAULT_LINK_MODE, DEFAULT_TRANSFER_BACKEND, LINK_MODES, TRANSFER_BACKENDS
+from rate_limit import parse_schedule
+from space_admission import (
+    DEFAULT_MIN_FREE_SPACE_GB, DEFAULT_SPACE_POLICY, HELD_STATUS, SPACE_POLICIES,
+    InsufficientSpaceError, admit, estimate_size, reservation
+)
 from websocket_manager import websocket_manager
 from security_utils import encrypt_value, decrypt_value
 from media_scanner import MediaScanner, get_media_type_from_path
@@ -26,6 +47,7 @@ from trakt_client import TraktClient
 from image_cache import get_cached_image_rec, save_cached_image, ensure_images_directory
 import logging
 import asyncio
+import json
 import time
 import os
 import imghdr
@@ -63,15 +85,16 @@ app.add_middleware(
 
 
 # Base paths for source and destination (Configurable via Env Vars for Cross-Platform Support)
-# In Docker, we map to /mnt/source and /mnt/destination by default
-SOURCE_BASE = os.getenv("SOURCE_MOUNT", "/mnt/source") 
-DESTINATION_BASE = os.getenv("DESTINATION_MOUNT", "/mnt/destination")
-
-# Deprecation Fallbacks (Maintain temporary compatibility if old env vars are set)
-if os.getenv("ZURG_BASE"):
-    SOURCE_BASE = os.getenv("ZURG_BASE")
-if os.getenv("HARDDRIVE_BASE"):
-    DESTINATION_BASE = os.getenv("HARDDRIVE_BASE")
+# In Docker, we map to /mnt/source and /mnt/destination by default.
+# Deprecation Fallbacks: the old ZURG_BASE / HARDDRIVE_BASE still win if set
+SOURCE_BASE = get_mount_path("source")
+DESTINATION_BASE = get_mount_path("destination")
+
+# Destination listings are invalidated on change, so they can stay cached much longer
+WATCHED_LISTING_TTL = 3600
+destination_watcher = DirectoryWatcher(
+    DESTINATION_BASE, on_change=lambda path: get_cache().remove(browse_key("destination", path))
+)
 
 # Import workers
 from enrichment_worker import enrichment_worker
@@ -100,7 +123,9 @@ async def startup_event():
     # 1. Initialize copy worker
     websocket_manager.set_event_loop(asyncio.get_event_loop())
     copy_worker.set_websocket_manager(websocket_manager)
+    copy_worker.post_copy.register("browse_cache", _invalidate_destination_listing)
     copy_worker.start()
+    destination_watcher.start()
 
     # Initialize periodic scanner
     global periodic_scanner
@@ -155,6 +180,7 @@ async def shutdown_event():
     """Stop workers on shutdown"""
     logger.info("🛑 Application shutdown...")
     copy_worker.stop()
+    destination_watcher.stop()
     await enrichment_worker.stop()
     if periodic_scanner:
         await periodic_scanner.stop()
@@ -190,6 +216,9 @@ class BrowseResponse(BaseModel):
 class CopyJobCreate(BaseModel):
     source_path: str
     destination_path: str
+    sync_mode: Optional[str] = None  # "size_mtime" or "hash": only copy new/changed files
+    rate_limit_mb_per_sec: Optional[float] = None  # Per-job bandwidth cap, 0 = unlimited
+    transfer_backend: Optional[str] = None  # auto, kernel, blocking, pipelined or mmap (None = settings default)
 
 
 class CopyJobResponse(BaseModel):
@@ -201,7 +230,17 @@ class CopyJobResponse(BaseModel):
     progress_percent: int
     total_size_bytes: int
     copied_size_bytes: int
+    checksum: Optional[str] = None
+    sync_mode: Optional[str] = None
+    skipped_size_bytes: Optional[int] = 0
+    rate_limit_mb_per_sec: Optional[float] = None
+    transfer_backend: Optional[str] = None
+    copy_method: Optional[str] = None
     error_message: Optional[str]
+    # Live values for running jobs
+    speed_bps: Optional[float] = None
+    speed_ewma_bps: Optional[float] = None
+    eta_seconds: Optional[float] = None
     created_at: datetime
     completed_at: Optional[datetime]
     
@@ -276,18 +315,49 @@ def browse_directory(
         raise HTTPException(status_code=400, detail="Invalid path")
     
     try:
-        result = list_directory(base_path, path, limit=limit, offset=offset, sort_by=sort_by, order=order)
-        return result
+        # Serve from the listing cache; sorting and paging happen in memory so
+        # page turns never touch the (possibly FUSE) mount
+        # Watched destination folders are invalidated on change and can stay cached
+        # longer; watch before any scan so a change during the scan isn't missed
+        ttl_seconds = None
+        if base_path == DESTINATION_BASE and destination_watcher.watch(path):
+            ttl_seconds = WATCHED_LISTING_TTL
+        listing = get_cache().get_or_load(browse_key(source, path), lambda: scan_directory(base_path, path),
+                                          ttl_seconds=ttl_seconds)
+        return paginate_listing(listing, limit=limit, offset=offset, sort_by=sort_by, order=order)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/browse/cache")
+def browse_cache_stats(current_user: User = Depends(get_current_user)):
+    """Directory listing cache size and hit/miss/eviction counters."""
+    stats = get_cache().stats()
+    stats["destination_watcher"] = destination_watcher.mode if destination_watcher.running else None
+    return stats
+
+
+@app.delete("/api/browse/cache")
+def clear_browse_cache(current_user: User = Depends(get_current_user)):
+    """Drop all cached directory listings."""
+    get_cache().clear()
+    return {"message": "Directory cache cleared"}
+
+
+def _invalidate_destination_listing(db: Session, job: CopyJob, duration: float):
+    """Post-copy hook: drop the cached listing of the folder a job wrote into."""
+    parent = os.path.dirname(job.destination_path.rstrip('/'))
+    if parent == DESTINATION_BASE.rstrip('/') or parent.startswith(DESTINATION_BASE.rstrip('/') + '/'):
+        get_cache().remove(browse_key("destination", parent[len(DESTINATION_BASE.rstrip('/')):]))
+
+
 @app.get("/api/folder-info")
 def folder_info(
     source: str = Query(..., description="Source location: source or destination"),
     path: str = Query(..., description="Relative path within the source"),
-    calculate_size: bool = Query(False, description="Calculate full recursive size (slow)"),
-    current_user: User = Depends(get_current_user)
+    calculate_size: bool = Query(False, description="Include the recursive size (from the folder size index)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """Get detailed information about a folder."""
     # Allow legacy 'zurg'/'16tb' for compatibility, but prefer 'source'/'destination'
@@ -309,10 +379,28 @@ def folder_info(
     if path and not validate_path(path, base_path):
         raise HTTPException(status_code=400, detail="Invalid path")
     
-    info = get_folder_info(base_path, path, calculate_size=calculate_size)
+    info = get_folder_info(base_path, path)
     if not info:
         raise HTTPException(status_code=404, detail="Folder not found")
     
+    if calculate_size:
+        # Indexed by the storage stats walk; only this folder is refreshed here if it changed
+        index_source = "source" if source in ["source", "zurg"] else "destination"
+        try:
+            sizes = get_folder_size(db, index_source, base_path, info["path"])
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Folder size index lookup failed for {info['path']}: {e}")
+            sizes = None
+        if sizes:
+            info["size"] = sizes["size"]
+            info["size_indexed_at"] = sizes["indexed_at"]
+        else:
+            # Not in the index: measure it live rather than report 0
+            info["size"] = get_directory_size(os.path.join(base_path, info["path"]))
+            info["size_indexed_at"] = None
+        info["size_formatted"] = format_size(info["size"])
+    
     return info
 
 
@@ -404,11 +492,31 @@ def get_job_details(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get details of a specific job."""
+    """Get details of a specific job (live progress while it is running)."""
     job = db.query(CopyJob).filter(CopyJob.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    return progress_registry.apply(CopyJobResponse.model_validate(job).model_dump())
+
+@app.get("/api/jobs/{job_id}/speed")
+def get_job_speed(
+    job_id: int,
+    current_user: User = Depends(get_current_user)
+):
+    """Speed telemetry and downsampled speed series of a running or recently finished job."""
+    history = progress_registry.speed_history(job_id)
+    if history is None:
+        raise HTTPException(status_code=404, detail="No speed history for this job")
+    return history
+
+
+@app.get("/api/copy/speed")
+def get_copy_speed(
+    current_user: User = Depends(get_current_user)
+):
+    """Combined speed of all running copies with its speed series (for the queue's speed graph)."""
+    return progress_registry.speed_history()
+
 
 @app.post("/api/copy/start", response_model=CopyJobResponse)
 def start_copy(
@@ -438,6 +546,13 @@ def start_copy(
     if not os.path.exists(source_full):
         raise HTTPException(status_code=404, detail="Source path does not exist")
     
+    if copy_data.sync_mode is not None and copy_data.sync_mode not in SYNC_MODES:
+        raise HTTPException(status_code=400, detail=f"sync_mode must be one of: {', '.join(SYNC_MODES)}")
+    if copy_data.rate_limit_mb_per_sec is not None and copy_data.rate_limit_mb_per_sec < 0:
+        raise HTTPException(status_code=400, detail="rate_limit_mb_per_sec must be >= 0")
+    if copy_data.transfer_backend is not None and copy_data.transfer_backend not in TRANSFER_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"transfer_backend must be one of: {', '.join(TRANSFER_BACKENDS)}")
+    
     dest_full = copy_data.destination_path
     if not dest_full.startswith('/'):
         dest_full = os.path.join(DESTINATION_BASE, copy_data.destination_path.lstrip('/'))
@@ -462,17 +577,37 @@ def start_copy(
         # But explicitly, if the user picked a folder 'Movies', they want 'Movies/Avatar'
         dest_full = os.path.join(dest_full, os.path.basename(source_full))
     
-    # Create the copy job
-    job = CopyJob(
-        source_path=source_full.replace('\\', '/'),
-        destination_path=dest_full.replace('\\', '/'),
-        status="queued",
-        progress_percent=0
-    )
+    # Size the copy before taking the enqueue lock (0 if not known yet, the worker sizes it)
+    size = estimate_size(db, source_full)
     
-    db.add(job)
-    db.commit()
+    with enqueue_lock:
+        # Same copy already queued, running or recently done: attach to it
+        existing = find_existing_job(db, source_full, dest_full, copy_data.sync_mode)
+        if existing:
+            logger.info(f"Copy request for {source_full} attached to existing job {existing.id} ({existing.status})")
+            return existing
+        
+        # Create the copy job
+        job = CopyJob(
+            source_path=source_full.replace('\\', '/'),
+            destination_path=dest_full.replace('\\', '/'),
+            progress_percent=0,
+            total_size_bytes=size,
+            sync_mode=copy_data.sync_mode,
+            rate_limit_mb_per_sec=copy_data.rate_limit_mb_per_sec,
+            transfer_backend=copy_data.transfer_backend
+        )
+        
+        # Reserve space on the destination (held or rejected if it won't fit)
+        try:
+            job.status, job.error_message = admit(db, dest_full, reservation(db, job))
+        except InsufficientSpaceError as e:
+            raise HTTPException(status_code=507, detail=str(e))
+        
+        db.add(job)
+        db.commit()
     db.refresh(job)
+    copy_worker.notify_new_jobs()
     
     return job
 
@@ -482,7 +617,7 @@ def get_queue(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all jobs in the queue (queued and processing)."""
+    """Get all jobs in the queue (queued, held and processing)."""
     jobs = db.query(
         CopyJob, 
         MediaItem.title.label("media_title"),
@@ -494,7 +629,7 @@ def get_queue(
     ).outerjoin(
         MediaItem, CopyJob.source_path == MediaItem.full_path
     ).filter(
-        CopyJob.status.in_(["queued", "processing"])
+        CopyJob.status.in_(["queued", HELD_STATUS, "processing"])
     ).order_by(CopyJob.created_at).all()
     
     # Convert to list of dicts that match CopyJobResponse
@@ -514,6 +649,12 @@ def get_queue(
             "progress_percent": job.progress_percent,
             "total_size_bytes": job.total_size_bytes,
             "copied_size_bytes": job.copied_size_bytes,
+            "checksum": job.checksum,
+            "sync_mode": job.sync_mode,
+            "skipped_size_bytes": job.skipped_size_bytes or 0,
+            "rate_limit_mb_per_sec": job.rate_limit_mb_per_sec,
+            "transfer_backend": job.transfer_backend,
+            "copy_method": job.copy_method,
             "error_message": job.error_message,
             "created_at": job.created_at,
             "completed_at": job.completed_at,
@@ -524,7 +665,8 @@ def get_queue(
             "media_poster": poster,
             "media_type": mtype
         }
-        enriched_jobs.append(job_data)
+        # Running jobs: bytes/speed/ETA straight from the copy worker's memory
+        enriched_jobs.append(progress_registry.apply(job_data))
         
     return enriched_jobs
 
@@ -566,6 +708,12 @@ def get_history(
             "progress_percent": job.progress_percent,
             "total_size_bytes": job.total_size_bytes,
             "copied_size_bytes": job.copied_size_bytes,
+            "checksum": job.checksum,
+            "sync_mode": job.sync_mode,
+            "skipped_size_bytes": job.skipped_size_bytes or 0,
+            "rate_limit_mb_per_sec": job.rate_limit_mb_per_sec,
+            "transfer_backend": job.transfer_backend,
+            "copy_method": job.copy_method,
             "error_message": job.error_message,
             "created_at": job.created_at,
             "completed_at": job.completed_at,
@@ -587,16 +735,16 @@ def cancel_job(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Cancel a queued or processing job."""
+    """Cancel a queued, held or processing job."""
     job = db.query(CopyJob).filter(CopyJob.id == job_id).first()
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    if job.status not in ["queued", "processing"]:
+    if job.status not in ["queued", HELD_STATUS, "processing"]:
         raise HTTPException(
             status_code=400,
-            detail=f"Cannot cancel {job.status} job. Only queued and processing jobs can be cancelled."
+            detail=f"Cannot cancel {job.status} job. Only queued, held and processing jobs can be cancelled."
         )
     
     # Use the copy worker's cancel method which handles cleanup
@@ -610,19 +758,17 @@ def clear_queue(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Cancel all active jobs (queued and processing)."""
+    """Cancel all active jobs (queued, held and processing)."""
     jobs = db.query(CopyJob).filter(
-        CopyJob.status.in_(["queued", "processing"])
+        CopyJob.status.in_(["queued", HELD_STATUS, "processing"])
     ).all()
     
+    # Same path as cancelling one job: running jobs stop, the rest lose their partial data
     count = 0
     for job in jobs:
-        job.status = "cancelled"
-        job.completed_at = datetime.utcnow()
+        copy_worker.cancel_job(job.id)
         count += 1
     
-    db.commit()
-    
     # Optional: Broadcast clear event to websocket if needed
     
     return {"message": f"Cancelled {count} jobs"}
@@ -646,17 +792,44 @@ def retry_job(
             detail="Can only retry failed jobs"
         )
     
-    # Create a new job with the same paths
-    new_job = CopyJob(
-        source_path=job.source_path,
-        destination_path=job.destination_path,
-        status="queued",
-        progress_percent=0
-    )
+    # Sized outside the enqueue lock
+    size = job.total_size_bytes or estimate_size(db, job.source_path)
     
-    db.add(new_job)
-    db.commit()
+    with enqueue_lock:
+        # The same copy may have been queued again since this one failed
+        existing = find_existing_job(db, job.source_path, job.destination_path, job.sync_mode)
+        if existing:
+            logger.info(f"Retry of job {job.id} attached to existing job {existing.id} ({existing.status})")
+            return existing
+        
+        # Create a new job with the same paths; with the checkpoint it resumes,
+        # so what the failed job already wrote doesn't need space again
+        resumes = os.path.exists(journal_path(job.id))
+        new_job = CopyJob(
+            source_path=job.source_path,
+            destination_path=job.destination_path,
+            progress_percent=0,
+            total_size_bytes=size,
+            copied_size_bytes=(job.copied_size_bytes or 0) if resumes else 0,
+            sync_mode=job.sync_mode,
+            rate_limit_mb_per_sec=job.rate_limit_mb_per_sec,
+            transfer_backend=job.transfer_backend
+        )
+        try:
+            new_job.status, new_job.error_message = admit(db, job.destination_path, reservation(db, new_job))
+        except InsufficientSpaceError as e:
+            raise HTTPException(status_code=507, detail=str(e))
+        
+        db.add(new_job)
+        db.flush()  # Assign the new ID before the worker can see the job
+        
+        # Carry over the checkpoint so the retry resumes instead of starting over
+        if CopyJournal.adopt(job.id, new_job.id):
+            logger.info(f"Retry job {new_job.id} will resume from checkpoint of job {job.id}")
+        
+        db.commit()
     db.refresh(new_job)
+    copy_worker.notify_new_jobs()
     
     return new_job
 
@@ -695,6 +868,42 @@ def set_job_priority(
     job.priority = priority_data.priority
     db.commit()
     db.refresh(job)
+    # A job raised to high priority may preempt a running one
+    copy_worker.notify_new_jobs()
+    
+    return job
+
+
+class RateLimitUpdate(BaseModel):
+    rate_limit_mb_per_sec: Optional[float] = None  # None = use the per-job default, 0 = unlimited
+
+
+@app.post("/api/copy/{job_id}/rate-limit", response_model=CopyJobResponse)
+def set_job_rate_limit(
+    job_id: int,
+    rate_data: RateLimitUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Set the bandwidth limit of a queued or running job (applies immediately)."""
+    job = db.query(CopyJob).filter(CopyJob.id == job_id).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if job.status not in ["queued", "processing"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Can only change the rate limit of queued or processing jobs"
+        )
+    
+    if rate_data.rate_limit_mb_per_sec is not None and rate_data.rate_limit_mb_per_sec < 0:
+        raise HTTPException(status_code=400, detail="rate_limit_mb_per_sec must be >= 0")
+    
+    job.rate_limit_mb_per_sec = rate_data.rate_limit_mb_per_sec
+    db.commit()
+    db.refresh(job)
+    copy_worker.refresh_rate_limits()
     
     return job
 
@@ -1061,6 +1270,20 @@ class SettingsUpdate(BaseModel):
     discord_webhook_url: Optional[str] = None
     discord_notify_success: Optional[bool] = None
     discord_notify_failure: Optional[bool] = None
+    copy_max_concurrent_jobs: Optional[int] = None
+    copy_max_jobs_per_source: Optional[int] = None
+    copy_max_jobs_per_destination: Optional[int] = None
+    copy_streams_per_job: Optional[int] = None
+    copy_verify_checksums: Optional[bool] = None
+    copy_rate_limit_mb_per_sec: Optional[float] = None
+    copy_job_rate_limit_mb_per_sec: Optional[float] = None
+    copy_rate_schedule: Optional[List[dict]] = None  # [{"start": "01:00", "end": "07:00", "limit_mb_per_sec": 0}]
+    copy_space_policy: Optional[str] = None  # hold, reject or off
+    copy_min_free_space_gb: Optional[float] = None
+    copy_dedupe_window_hours: Optional[float] = None  # 0 = only dedupe against active jobs
+    copy_link_mode: Optional[str] = None  # auto (reflink, then hardlink), reflink or off
+    copy_preempt_priority_gap: Optional[int] = None  # 0 = never pause running jobs for urgent ones
+    copy_transfer_backend: Optional[str] = None  # Default for jobs that don't pick one
 
 
 class StatsFullResponse(BaseModel):
@@ -1141,10 +1364,12 @@ async def proxy_image(
 class BatchCopyRequest(BaseModel):
     item_ids: List[int]
     destination_path: str
+    sync_mode: Optional[str] = None
+    transfer_backend: Optional[str] = None
 
 
 @app.post("/api/library/batch-copy")
-async def batch_copy_items(
+def batch_copy_items(
     request: BatchCopyRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -1155,6 +1380,10 @@ async def batch_copy_items(
     
     if not request.destination_path:
         raise HTTPException(status_code=400, detail="No destination path provided")
+    if request.sync_mode is not None and request.sync_mode not in SYNC_MODES:
+        raise HTTPException(status_code=400, detail=f"sync_mode must be one of: {', '.join(SYNC_MODES)}")
+    if request.transfer_backend is not None and request.transfer_backend not in TRANSFER_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"transfer_backend must be one of: {', '.join(TRANSFER_BACKENDS)}")
     
     # Get all media items by ID
     items = db.query(MediaItem).filter(MediaItem.id.in_(request.item_ids)).all()
@@ -1171,39 +1400,72 @@ async def batch_copy_items(
     
     dest_base = os.path.normpath(os.path.join(DESTINATION_BASE, request.destination_path.lstrip('/')))
     
+    # Size every item before taking the enqueue lock (0 if not known yet, the worker sizes it)
+    sizes = {item.id: item.size_bytes or estimate_size(db, item.full_path) for item in items}
+    
     # Create copy jobs for each item
     created_jobs = []
-    for item in items:
-        source_path = item.full_path
-        
-        # Determine destination based on media type
-        if item.media_type == 'tv':
-            # For TV shows, keep the folder structure
-            dest = os.path.join(dest_base, os.path.basename(source_path))
-        else:
-            # For movies, just copy the file/folder
-            dest = os.path.join(dest_base, os.path.basename(source_path))
+    attached_jobs = []
+    rejected = []
+    batch_jobs = {}  # job_key -> job created earlier in this batch
+    with enqueue_lock:
+        for item in items:
+            source_path = item.full_path
+            
+            # Determine destination based on media type
+            if item.media_type == 'tv':
+                # For TV shows, keep the folder structure
+                dest = os.path.join(dest_base, os.path.basename(source_path))
+            else:
+                # For movies, just copy the file/folder
+                dest = os.path.join(dest_base, os.path.basename(source_path))
+            
+            # Repeated within this batch, or already queued, running or recently copied
+            existing = batch_jobs.get(job_key(source_path, dest)) or find_existing_job(db, source_path, dest, request.sync_mode)
+            if existing:
+                attached_jobs.append(existing)
+                continue
+            
+            job = CopyJob(
+                source_path=source_path.replace('\\', '/'),
+                destination_path=dest.replace('\\', '/'),
+                priority=1,
+                progress_percent=0,
+                total_size_bytes=sizes[item.id],
+                sync_mode=request.sync_mode,
+                transfer_backend=request.transfer_backend
+            )
+            # Jobs added earlier in this batch are flushed, so they count as reservations here
+            try:
+                job.status, job.error_message = admit(db, dest, reservation(db, job))
+            except InsufficientSpaceError as e:
+                rejected.append({"item_id": item.id, "title": item.title, "error": str(e)})
+                continue
+            db.add(job)
+            # SessionLocal doesn't autoflush: flush so the next admit() sees this reservation
+            db.flush()
+            batch_jobs[job_key(source_path, dest)] = job
+            created_jobs.append(job)
         
-        job = CopyJob(
-            source_path=source_path.replace('\\', '/'),
-            destination_path=dest.replace('\\', '/'),
-            status="queued",
-            priority=1,
-            progress_percent=0
-        )
-        db.add(job)
-        created_jobs.append(job)
-    
-    db.commit()
+        db.commit()
     
     # Refresh to get IDs
     for job in created_jobs:
         db.refresh(job)
+    copy_worker.notify_new_jobs()
+    
+    message = f"Created {len(created_jobs)} copy jobs"
+    if attached_jobs:
+        message += f", {len(attached_jobs)} already queued or copied"
+    if rejected:
+        message += f", {len(rejected)} rejected for lack of free space"
     
     return {
         "success": True,
-        "message": f"Created {len(created_jobs)} copy jobs",
-        "job_ids": [job.id for job in created_jobs]
+        "message": message,
+        "job_ids": [job.id for job in created_jobs],
+        "existing_job_ids": list(dict.fromkeys(job.id for job in attached_jobs)),
+        "rejected": rejected
     }
 
 
@@ -1630,8 +1892,83 @@ async def update_settings(
             new_setting = SystemSettings(key="discord_notify_failure", value=val, is_encrypted=False)
             db.add(new_setting)
     
+    # Update copy checksum verification if provided
+    if settings.copy_verify_checksums is not None:
+        existing = db.query(SystemSettings).filter(SystemSettings.key == "copy_verify_checksums").first()
+        val = "true" if settings.copy_verify_checksums else "false"
+        if existing:
+            existing.value = val
+            existing.updated_at = datetime.utcnow()
+        else:
+            new_setting = SystemSettings(key="copy_verify_checksums", value=val, is_encrypted=False)
+            db.add(new_setting)
+    
+    # Update copy worker concurrency limits if provided (picked up by the worker on its next pass)
+    copy_limits = {
+        "copy_max_concurrent_jobs": 16,
+        "copy_max_jobs_per_source": 16,
+        "copy_max_jobs_per_destination": 16,
+        "copy_streams_per_job": MAX_STREAMS_PER_JOB,
+    }
+    for key, max_value in copy_limits.items():
+        value = getattr(settings, key)
+        if value is None:
+            continue
+        if value < 1 or value > max_value:
+            raise HTTPException(status_code=400, detail=f"{key} must be between 1 and {max_value}")
+        existing = db.query(SystemSettings).filter(SystemSettings.key == key).first()
+        if existing:
+            existing.value = str(value)
+            existing.updated_at = datetime.utcnow()
+        else:
+            db.add(SystemSettings(key=key, value=str(value), is_encrypted=False))
+    
+    # Update bandwidth limits (MB/s, 0 = unlimited) and the time-of-day schedule if provided
+    copy_values = {
+        "copy_rate_limit_mb_per_sec": settings.copy_rate_limit_mb_per_sec,
+        "copy_job_rate_limit_mb_per_sec": settings.copy_job_rate_limit_mb_per_sec,
+    }
+    if settings.copy_rate_schedule is not None:
+        try:
+            parse_schedule(settings.copy_rate_schedule)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid copy_rate_schedule: {e}")
+        copy_values["copy_rate_schedule"] = json.dumps(settings.copy_rate_schedule)
+    
+    # Free space admission: what happens to jobs that don't fit, and the margin to keep free
+    if settings.copy_space_policy is not None and settings.copy_space_policy not in SPACE_POLICIES:
+        raise HTTPException(status_code=400, detail=f"copy_space_policy must be one of: {', '.join(SPACE_POLICIES)}")
+    copy_values["copy_space_policy"] = settings.copy_space_policy
+    copy_values["copy_min_free_space_gb"] = settings.copy_min_free_space_gb
+    copy_values["copy_dedupe_window_hours"] = settings.copy_dedupe_window_hours
+    
+    # Same-filesystem fast path
+    if settings.copy_link_mode is not None and settings.copy_link_mode not in LINK_MODES:
+        raise HTTPException(status_code=400, detail=f"copy_link_mode must be one of: {', '.join(LINK_MODES)}")
+    copy_values["copy_link_mode"] = settings.copy_link_mode
+    copy_values["copy_preempt_priority_gap"] = settings.copy_preempt_priority_gap
+    if settings.copy_transfer_backend is not None and settings.copy_transfer_backend not in TRANSFER_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"copy_transfer_backend must be one of: {', '.join(TRANSFER_BACKENDS)}")
+    copy_values["copy_transfer_backend"] = settings.copy_transfer_backend
+    for key, value in copy_values.items():
+        if value is None:
+            continue
+        if not isinstance(value, str) and value < 0:
+            raise HTTPException(status_code=400, detail=f"{key} must be >= 0")
+        existing = db.query(SystemSettings).filter(SystemSettings.key == key).first()
+        if existing:
+            existing.value = str(value)
+            existing.updated_at = datetime.utcnow()
+        else:
+            db.add(SystemSettings(key=key, value=str(value), is_encrypted=False))
+    
     db.commit()
     
+    # Running copies pick up new bandwidth limits right away
+    copy_worker.refresh_rate_limits()
+    # Re-check held jobs against the new free space policy
+    copy_worker.notify_new_jobs()
+    
     # Start enrichment worker if Trakt ID was just added and it's not running
     if settings.trakt_client_id:
         from enrichment_worker import enrichment_worker
@@ -1659,6 +1996,20 @@ async def get_settings(
     discord_webhook_val = get_val("discord_webhook_url")
     discord_notify_success = get_val("discord_notify_success")
     discord_notify_failure = get_val("discord_notify_failure")
+    max_jobs_val = get_val("copy_max_concurrent_jobs")
+    per_source_val = get_val("copy_max_jobs_per_source")
+    per_dest_val = get_val("copy_max_jobs_per_destination")
+    streams_val = get_val("copy_streams_per_job")
+    verify_val = get_val("copy_verify_checksums")
+    rate_val = get_val("copy_rate_limit_mb_per_sec")
+    job_rate_val = get_val("copy_job_rate_limit_mb_per_sec")
+    schedule_val = get_val("copy_rate_schedule")
+    space_policy_val = get_val("copy_space_policy")
+    min_free_val = get_val("copy_min_free_space_gb")
+    dedupe_window_val = get_val("copy_dedupe_window_hours")
+    link_mode_val = get_val("copy_link_mode")
+    preempt_gap_val = get_val("copy_preempt_priority_gap")
+    transfer_backend_val = get_val("copy_transfer_backend")
 
     return {
         "trakt_client_id": "********" if trakt_val else None,
@@ -1668,7 +2019,21 @@ async def get_settings(
         "discord_webhook_configured": bool(discord_webhook_val),
         "discord_notify_success": discord_notify_success == "true" if discord_notify_success else True,
         "discord_notify_failure": discord_notify_failure == "true" if discord_notify_failure else True,
-        "scan_interval_seconds": int(scan_interval_val) if scan_interval_val else 300
+        "scan_interval_seconds": int(scan_interval_val) if scan_interval_val else 300,
+        "copy_max_concurrent_jobs": int(max_jobs_val) if max_jobs_val else DEFAULT_MAX_CONCURRENT_JOBS,
+        "copy_max_jobs_per_source": int(per_source_val) if per_source_val else DEFAULT_MAX_JOBS_PER_SOURCE,
+        "copy_max_jobs_per_destination": int(per_dest_val) if per_dest_val else DEFAULT_MAX_JOBS_PER_DESTINATION,
+        "copy_streams_per_job": int(streams_val) if streams_val else DEFAULT_STREAMS_PER_JOB,
+        "copy_verify_checksums": verify_val == "true" if verify_val else False,
+        "copy_rate_limit_mb_per_sec": float(rate_val) if rate_val else 0,
+        "copy_job_rate_limit_mb_per_sec": float(job_rate_val) if job_rate_val else 0,
+        "copy_rate_schedule": json.loads(schedule_val) if schedule_val else [],
+        "copy_space_policy": space_policy_val or DEFAULT_SPACE_POLICY,
+        "copy_min_free_space_gb": float(min_free_val) if min_free_val else DEFAULT_MIN_FREE_SPACE_GB,
+        "copy_dedupe_window_hours": float(dedupe_window_val) if dedupe_window_val else DEFAULT_DEDUPE_WINDOW_HOURS,
+        "copy_link_mode": link_mode_val or DEFAULT_LINK_MODE,
+        "copy_preempt_priority_gap": int(preempt_gap_val) if preempt_gap_val else DEFAULT_PREEMPT_PRIORITY_GAP,
+        "copy_transfer_backend": transfer_backend_val or DEFAULT_TRANSFER_BACKEND
     }
 
 @app.post("/api/settings/validate")
@@ -119,6 +119,69 @@ def migrate():
             else:
                 logger.info(f"'{col_name}' column already exists.")
 
+        # Migration 7: Add copy job checksum (streaming verification)
+        cursor.execute("PRAGMA table_info(copy_jobs)")
+        copy_jobs_columns = [row[1] for row in cursor.fetchall()]
+
+        if "checksum" not in copy_jobs_columns:
+            logger.info("Adding 'checksum' column to 'copy_jobs' table...")
+            cursor.execute("ALTER TABLE copy_jobs ADD COLUMN checksum TEXT")
+            conn.commit()
+            logger.info("Successfully added 'checksum' column.")
+        else:
+            logger.info("'checksum' column already exists.")
+
+        # Migration 8: Add incremental sync columns to copy jobs
+        if "sync_mode" not in copy_jobs_columns:
+            logger.info("Adding 'sync_mode' column to 'copy_jobs' table...")
+            cursor.execute("ALTER TABLE copy_jobs ADD COLUMN sync_mode TEXT")
+            conn.commit()
+            logger.info("Successfully added 'sync_mode' column.")
+        else:
+            logger.info("'sync_mode' column already exists.")
+
+        if "skipped_size_bytes" not in copy_jobs_columns:
+            logger.info("Adding 'skipped_size_bytes' column to 'copy_jobs' table...")
+            cursor.execute("ALTER TABLE copy_jobs ADD COLUMN skipped_size_bytes BIGINT DEFAULT 0")
+            conn.commit()
+            logger.info("Successfully added 'skipped_size_bytes' column.")
+        else:
+            logger.info("'skipped_size_bytes' column already exists.")
+
+        # Migration 9: Add per-job bandwidth limit
+        if "rate_limit_mb_per_sec" not in copy_jobs_columns:
+            logger.info("Adding 'rate_limit_mb_per_sec' column to 'copy_jobs' table...")
+            cursor.execute("ALTER TABLE copy_jobs ADD COLUMN rate_limit_mb_per_sec FLOAT")
+            conn.commit()
+            logger.info("Successfully added 'rate_limit_mb_per_sec' column.")
+        else:
+            logger.info("'rate_limit_mb_per_sec' column already exists.")
+
+        # Migration 10: Index copy jobs by (source, destination) for deduplication
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_copy_jobs_source_destination "
+            "ON copy_jobs (source_path, destination_path)"
+        )
+        conn.commit()
+
+        # Migration 11: Record how a job's files were transferred (copy, reflink, hardlink)
+        if "copy_method" not in copy_jobs_columns:
+            logger.info("Adding 'copy_method' column to 'copy_jobs' table...")
+            cursor.execute("ALTER TABLE copy_jobs ADD COLUMN copy_method TEXT")
+            conn.commit()
+            logger.info("Successfully added 'copy_method' column.")
+        else:
+            logger.info("'copy_method' column already exists.")
+
+        # Migration 12: Per-job transfer backend
+        if "transfer_backend" not in copy_jobs_columns:
+            logger.info("Adding 'transfer_backend' column to 'copy_jobs' table...")
+            cursor.execute("ALTER TABLE copy_jobs ADD COLUMN transfer_backend TEXT")
+            conn.commit()
+            logger.info("Successfully added 'transfer_backend' column.")
+        else:
+            logger.info("'transfer_backend' column already exists.")
+
     except Exception as e:
         logger.error(f"Migration failed: {e}")
         conn.rollback()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Text, Boolean, Float, Date
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Text, Boolean, Float, Date, Index
 from datetime import datetime
 from database import Base
 
@@ -100,10 +100,19 @@ class CopyJob(Base):
     progress_percent = Column(Integer, default=0)
     total_size_bytes = Column(BigInteger, default=0)
     copied_size_bytes = Column(BigInteger, default=0)
+    checksum = Column(String, nullable=True)  # "<algorithm>:<hex>" when verification is enabled
+    sync_mode = Column(String, nullable=True)  # None = full copy, "size_mtime" or "hash" = incremental sync
+    skipped_size_bytes = Column(BigInteger, default=0)  # Unchanged bytes left in place by a sync
+    rate_limit_mb_per_sec = Column(Float, nullable=True)  # Per-job bandwidth cap (None = default, 0 = unlimited)
+    transfer_backend = Column(String, nullable=True)  # None = copy_transfer_backend setting; "auto", "kernel", "blocking", "pipelined" or "mmap"
+    copy_method = Column(String, nullable=True)  # How files were transferred: "copy", "reflink", "hardlink" or e.g. "reflink+copy"
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
 
+    # Deduplication looks jobs up by (source, destination)
+    __table_args__ = (Index("ix_copy_jobs_source_destination", "source_path", "destination_path"),)
+
 
 class StorageStats(Base):
     __tablename__ = "storage_stats"
@@ -117,3 +126,19 @@ class StorageStats(Base):
     folder_count = Column(Integer, default=0)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+
+class FolderSize(Base):
+    """Recursive size of one directory, maintained by folder_index from the storage stats walk."""
+    __tablename__ = "folder_sizes"
+
+    source = Column(String, primary_key=True)  # 'source' or 'destination'
+    path = Column(String, primary_key=True)  # Relative to the mount, '' = its root
+    mtime = Column(Float)  # The directory's own mtime when its entries were last read
+    own_size = Column(BigInteger, default=0)  # Files directly inside
+    own_files = Column(Integer, default=0)
+    own_folders = Column(Integer, default=0)
+    total_size = Column(BigInteger, default=0)  # Everything below, recursively
+    file_count = Column(Integer, default=0)
+    folder_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
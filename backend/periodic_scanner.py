@@ -11,7 +11,8 @@ from models import SystemSettings, StorageStats
 from datetime import datetime
 import os
 import shutil
-from file_operations import format_size
+from file_operations import format_size, get_mount_path
+import folder_index
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -37,30 +38,16 @@ class PeriodicScanner:
                 pass
         return 300  # Default 5 minutes
 
-    def _get_folder_stats(self, path: str) -> dict:
-        """Calculate size, file count, and folder count for a directory."""
-        total_size = 0
-        file_count = 0
-        folder_count = 0
-        
+    def _get_folder_stats(self, db: Session, source: str, base_path: str, relative_path: str = "") -> dict:
+        """Size, file count, and folder count for a directory, refreshed into the folder size index."""
         try:
-            if not os.path.exists(path):
+            stats = folder_index.refresh(db, source, base_path, relative_path)
+            if not stats:
                 return {"size": 0, "files": 0, "folders": 0}
-                
-            for root, dirs, files in os.walk(path):
-                folder_count += len(dirs)
-                file_count += len(files)
-                for f in files:
-                    fp = os.path.join(root, f)
-                    try:
-                        # Skip if it's a broken symlink
-                        if os.path.exists(fp):
-                            total_size += os.path.getsize(fp)
-                    except:
-                        pass
-            return {"size": total_size, "files": file_count, "folders": folder_count}
+            return stats
         except Exception as e:
-            logger.error(f"Error calculating folder stats for {path}: {e}")
+            db.rollback()
+            logger.error(f"Error calculating folder stats for {os.path.join(base_path, relative_path)}: {e}")
             return {"size": 0, "files": 0, "folders": 0}
 
     def update_storage_stats(self, db: Session):
@@ -80,7 +67,7 @@ class PeriodicScanner:
             for subdir in target_subdirs:
                 path = os.path.join(source_base, subdir)
                 if os.path.exists(path):
-                    stats = self._get_folder_stats(path)
+                    stats = self._get_folder_stats(db, "source", source_base, subdir)
                     source_total_size += stats["size"]
                     source_file_count += stats["files"]
                     source_folder_count += stats["folders"]
@@ -106,8 +93,8 @@ class PeriodicScanner:
             zurg_stats.updated_at = datetime.utcnow()
             
             # 2. Destination (Local/Harddrive)
-            # Use os.getenv as fallback if settings not set
-            dest_base = os.getenv("DESTINATION_MOUNT", "/mnt/destination")
+            # Same resolver as the API, so folder-info finds these index rows
+            dest_base = get_mount_path("destination")
             
             # ALWAYS scan the full base directory to get accurate drive stats
             # This ensures dashboard shows total files on the drive, not just in configured folders
@@ -119,7 +106,7 @@ class PeriodicScanner:
             
             for path in dest_paths:
                 if os.path.exists(path):
-                    stats = self._get_folder_stats(path)
+                    stats = self._get_folder_stats(db, "destination", path)
                     dest_total_size += stats["size"]
                     dest_file_count += stats["files"]
                     dest_folder_count += stats["folders"]
@@ -0,0 +1,106 @@
+"""
+Post-completion hooks for copy jobs.
+
+When a job finishes, the copy thread only queues an event here and moves
+on to its next transfer. A single background thread then runs the
+registered hooks (Discord notification, storage stats refresh, ...) with
+its own database session. Hooks that are expensive and only need the
+latest state, like walking the destination drive for stats, can ask to be
+coalesced: a burst of completions then triggers one run instead of many.
+"""
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from database import SessionLocal
+from models import CopyJob
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+class PostCopyHook(NamedTuple):
+    name: str
+    func: Callable  # func(db, job, duration_seconds)
+    statuses: Sequence[str]
+    coalesce: bool
+
+
+class PostCopyPipeline:
+    """Queue + worker thread running hooks after jobs finish, off the copy threads."""
+
+    def __init__(self):
+        self.hooks: List[PostCopyHook] = []
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._pending_coalesced: Dict[str, int] = {}  # hook name -> latest job id waiting
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.processed = 0
+        self.failures = 0
+
+    def register(self, name: str, func: Callable, statuses: Sequence[str] = FINISHED_STATUSES,
+                 coalesce: bool = False):
+        """Run `func(db, job, duration)` after jobs that end in one of `statuses`."""
+        self.hooks.append(PostCopyHook(name, func, tuple(statuses), coalesce))
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True, name="post-copy")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Finish what is queued (up to `timeout` seconds), then stop the worker thread."""
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            print(f"Post-copy hooks still running at shutdown ({self._queue.qsize()} queued)")
+        self._thread = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, job: CopyJob, duration: float):
+        """Queue the hooks for a finished job. Cheap; safe to call from any copy thread."""
+        for hook in self.hooks:
+            if job.status not in hook.statuses:
+                continue
+            if hook.coalesce:
+                with self._lock:
+                    already_queued = hook.name in self._pending_coalesced
+                    self._pending_coalesced[hook.name] = job.id
+                if already_queued:
+                    continue
+            self._queue.put((hook, job.id, duration))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            hook, job_id, duration = item
+            if hook.coalesce:
+                # Run for the most recent job that asked, and let the next one queue again
+                with self._lock:
+                    job_id = self._pending_coalesced.pop(hook.name, job_id)
+            self._run_hook(hook, job_id, duration)
+
+    def _run_hook(self, hook: PostCopyHook, job_id: int, duration: float):
+        db = SessionLocal()
+        started = time.monotonic()
+        try:
+            job = db.query(CopyJob).filter(CopyJob.id == job_id).first()
+            if job:
+                hook.func(db, job, duration)
+            self.processed += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"Post-copy hook '{hook.name}' failed for job {job_id}: {e}")
+        finally:
+            db.close()
+        elapsed = time.monotonic() - started
+        if elapsed > 5:
+            print(f"Post-copy hook '{hook.name}' for job {job_id} took {elapsed:.1f}s")
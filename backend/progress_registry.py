@@ -0,0 +1,248 @@
+"""
+In-memory live progress for running copy jobs.
+
+Copy threads report every chunk here instead of committing to SQLite. The
+copy worker writes all running jobs back to `copy_jobs` in one batched
+UPDATE every PROGRESS_FLUSH_INTERVAL seconds, and the API overlays the live
+values on top of the stored rows, so readers see current numbers without
+the copy loop ever taking the database write lock.
+
+Each job (and the worker as a whole) also gets a ThroughputTracker with
+instantaneous, rolling-window and EWMA speeds and a downsampled speed
+series, so every client sees the same speed and ETA.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from models import CopyJob
+
+PROGRESS_FLUSH_INTERVAL = 5.0  # Seconds between batched writes to copy_jobs
+SPEED_SAMPLE_INTERVAL = 1.0    # Minimum seconds between speed samples
+SPEED_WINDOW_SECONDS = 10.0    # Rolling average window
+SPEED_EWMA_ALPHA = 0.3         # Weight of the newest sample in the EWMA
+SPEED_STALL_SECONDS = 3.0      # No samples for this long = speed 0
+SERIES_MAX_POINTS = 120        # Speed series is downsampled to stay under this
+OVERALL_SERIES_STEP = 5.0      # Combined series: one point per 5s, last 10 minutes
+FINISHED_JOBS_KEPT = 50        # Speed series kept for recently finished jobs
+
+
+class ThroughputTracker:
+    """
+    Speed statistics for a growing byte counter. Samples are taken at most
+    once per SPEED_SAMPLE_INTERVAL. The speed series starts at one point per
+    sample and halves its resolution (averaging pairs) whenever it would
+    exceed SERIES_MAX_POINTS, so it always spans the whole transfer. With
+    `rolling=True` the step stays fixed and the oldest points are dropped.
+    """
+
+    def __init__(self, initial_bytes: int = 0, series_step: float = SPEED_SAMPLE_INTERVAL, rolling: bool = False):
+        self.started = time.monotonic()
+        self.instant_bps = 0.0
+        self.average_bps = 0.0
+        self.ewma_bps = 0.0
+        self.series: List[List[float]] = []  # [seconds since start, bytes/sec]
+        self._last_time = self.started
+        self._last_bytes = initial_bytes
+        self._window = deque([(self.started, initial_bytes)])
+        self._has_sample = False
+        self.series_step = series_step
+        self.rolling = rolling
+        self._bucket: List[float] = []
+        self._bucket_start = self.started
+
+    def record(self, total_bytes: int, now: Optional[float] = None):
+        now = now or time.monotonic()
+        elapsed = now - self._last_time
+        if elapsed < SPEED_SAMPLE_INTERVAL:
+            return
+        sample = max(0.0, (total_bytes - self._last_bytes) / elapsed)
+        self._last_time = now
+        self._last_bytes = total_bytes
+
+        self.instant_bps = sample
+        self.ewma_bps = sample if not self._has_sample else (
+            SPEED_EWMA_ALPHA * sample + (1 - SPEED_EWMA_ALPHA) * self.ewma_bps
+        )
+        self._has_sample = True
+
+        self._window.append((now, total_bytes))
+        while len(self._window) > 2 and now - self._window[0][0] > SPEED_WINDOW_SECONDS:
+            self._window.popleft()
+        first_time, first_bytes = self._window[0]
+        if now > first_time:
+            self.average_bps = max(0.0, (total_bytes - first_bytes) / (now - first_time))
+
+        self._add_to_series(now, sample)
+
+    def _add_to_series(self, now: float, sample: float):
+        self._bucket.append(sample)
+        if now - self._bucket_start < self.series_step:
+            return
+        self.series.append([round(self._bucket_start - self.started, 1), sum(self._bucket) / len(self._bucket)])
+        self._bucket = []
+        self._bucket_start = now
+        if len(self.series) > SERIES_MAX_POINTS and self.rolling:
+            del self.series[0]
+        elif len(self.series) > SERIES_MAX_POINTS:
+            merged = []
+            for i in range(0, len(self.series) - 1, 2):
+                merged.append([self.series[i][0], (self.series[i][1] + self.series[i + 1][1]) / 2])
+            if len(self.series) % 2:
+                merged.append(self.series[-1])
+            self.series = merged
+            self.series_step *= 2
+
+    def is_stalled(self, now: Optional[float] = None) -> bool:
+        return (now or time.monotonic()) - self._last_time > SPEED_STALL_SECONDS
+
+    def to_dict(self) -> Dict:
+        stalled = self.is_stalled()
+        return {
+            "speed_bps": 0.0 if stalled else self.instant_bps,
+            "speed_avg_bps": 0.0 if stalled else self.average_bps,
+            "speed_ewma_bps": 0.0 if stalled else self.ewma_bps,
+        }
+
+
+class JobProgress:
+    """Live counters for one running job."""
+
+    def __init__(self, job_id: int, total_bytes: int, copied_bytes: int = 0):
+        self.job_id = job_id
+        self.total_bytes = total_bytes
+        self.copied_bytes = copied_bytes
+        self.updated_at = time.time()
+        self.tracker = ThroughputTracker(initial_bytes=copied_bytes)
+
+    @property
+    def progress_percent(self) -> int:
+        if self.total_bytes <= 0:
+            return 0
+        # Never show 100% until the job is marked complete
+        return min(int(self.copied_bytes / self.total_bytes * 100), 99)
+
+    def to_dict(self) -> Dict:
+        data = {
+            "job_id": self.job_id,
+            "copied_size_bytes": self.copied_bytes,
+            "total_size_bytes": self.total_bytes,
+            "progress_percent": self.progress_percent,
+            "updated_at": self.updated_at,
+        }
+        data.update(self.tracker.to_dict())
+        # ETA from the smoothed speed so it doesn't jump around with every sample
+        speed = data["speed_ewma_bps"]
+        data["eta_seconds"] = max(0, self.total_bytes - self.copied_bytes) / speed if speed > 0 else None
+        return data
+
+
+class ProgressRegistry:
+    """Thread-safe map of job_id -> JobProgress for jobs that are copying right now."""
+
+    def __init__(self):
+        self._jobs: Dict[int, JobProgress] = {}
+        self._finished: "OrderedDict[int, Dict]" = OrderedDict()  # job_id -> last values + series
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        # Combined throughput of all jobs, for the queue's speed graph
+        self._total_copied = 0
+        self._overall = ThroughputTracker(series_step=OVERALL_SERIES_STEP, rolling=True)
+
+    def start(self, job_id: int, total_bytes: int, resumed_bytes: int = 0):
+        """Track a job; `resumed_bytes` already on disk count as copied but not towards its speed."""
+        with self._lock:
+            self._jobs[job_id] = JobProgress(job_id, total_bytes, resumed_bytes)
+
+    def update(self, job_id: int, copied_bytes: int):
+        """Record a job's running byte count (cheap, called for every chunk)."""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if not entry:
+                return
+            self._total_copied += max(0, copied_bytes - entry.copied_bytes)
+            entry.copied_bytes = copied_bytes
+            entry.updated_at = time.time()
+            now = time.monotonic()
+            entry.tracker.record(copied_bytes, now)
+            self._overall.record(self._total_copied, now)
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            return entry.to_dict() if entry else None
+
+    def finish(self, job_id: int) -> Optional[Dict]:
+        """Stop tracking a job; returns its last values (its speed series is kept a while)."""
+        with self._lock:
+            entry = self._jobs.pop(job_id, None)
+            if not entry:
+                return None
+            data = entry.to_dict()
+            self._finished[job_id] = {"series": entry.tracker.series, "step_seconds": entry.tracker.series_step}
+            while len(self._finished) > FINISHED_JOBS_KEPT:
+                self._finished.popitem(last=False)
+            return data
+
+    def speed_history(self, job_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Downsampled speed series ([seconds since start, bytes/sec] points) for
+        one job, or for all jobs combined when `job_id` is None.
+        """
+        with self._lock:
+            if job_id is None:
+                # Sample now so idle periods show up as zero speed
+                self._overall.record(self._total_copied)
+                data = self._overall.to_dict()
+                data.update(series=list(self._overall.series), step_seconds=self._overall.series_step,
+                            active_jobs=len(self._jobs))
+                return data
+            entry = self._jobs.get(job_id)
+            if entry:
+                data = entry.to_dict()
+                data.update(series=list(entry.tracker.series), step_seconds=entry.tracker.series_step)
+                return data
+            finished = self._finished.get(job_id)
+            return dict(finished, job_id=job_id) if finished else None
+
+    def flush_due(self) -> bool:
+        return bool(self._jobs) and time.monotonic() - self._last_flush >= PROGRESS_FLUSH_INTERVAL
+
+    def flush(self, db: Session) -> int:
+        """Write every live job's progress to copy_jobs in one batched UPDATE."""
+        with self._lock:
+            rows = [
+                {"job_id": e.job_id, "copied": e.copied_bytes, "percent": e.progress_percent}
+                for e in self._jobs.values()
+            ]
+            self._last_flush = time.monotonic()
+        if not rows:
+            return 0
+        # Only rows still processing: never overwrite a job that just finished
+        stmt = (
+            update(CopyJob.__table__)
+            .where(CopyJob.__table__.c.id == bindparam("job_id"))
+            .where(CopyJob.__table__.c.status == "processing")
+            .values(copied_size_bytes=bindparam("copied"), progress_percent=bindparam("percent"))
+        )
+        db.execute(stmt, rows)
+        db.commit()
+        return len(rows)
+
+    def apply(self, job_data: Dict) -> Dict:
+        """Overlay live values on an API job dict (keyed like CopyJobResponse)."""
+        live = self.get(job_data["id"])
+        if live:
+            job_data["copied_size_bytes"] = live["copied_size_bytes"]
+            job_data["progress_percent"] = live["progress_percent"]
+            job_data["speed_bps"] = live["speed_bps"]
+            job_data["speed_ewma_bps"] = live["speed_ewma_bps"]
+            job_data["eta_seconds"] = live["eta_seconds"]
+        return job_data
+
+
+progress_registry = ProgressRegistry()
@@ -0,0 +1,132 @@
+"""
+Bandwidth limiting for copy jobs.
+
+Copies are throttled with token buckets: every chunk the copy loop moves is
+charged to the global bucket and to the job's own bucket, and the copying
+thread sleeps while a bucket is in debt. Rates can change at any time (the
+worker re-applies the settings and the time-of-day schedule every few
+seconds), and a sleeping copy picks up the new rate straight away.
+"""
+import json
+import threading
+import time
+from datetime import datetime, time as dt_time
+from typing import Callable, Dict, List, Optional
+
+MB = 1024 * 1024
+BURST_SECONDS = 1.0  # A bucket holds up to one second of traffic
+_MAX_SLEEP = 0.25    # Re-check rate changes and cancellation this often
+
+
+class TokenBucket:
+    """Thread-safe token bucket; a rate of 0 means unlimited."""
+
+    def __init__(self, rate: float = 0, burst_seconds: float = BURST_SECONDS):
+        self.burst_seconds = burst_seconds
+        self._rate = max(0.0, float(rate))
+        self._tokens = self._burst()
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _burst(self) -> float:
+        return self._rate * self.burst_seconds
+
+    def _refill_locked(self):
+        now = time.monotonic()
+        if self._rate > 0:
+            self._tokens = min(self._burst(), self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    def set_rate(self, rate: float):
+        """Change the rate in bytes/second (0 = unlimited); applies to waiting threads too."""
+        rate = max(0.0, float(rate or 0))
+        with self._lock:
+            if rate == self._rate:
+                return
+            self._refill_locked()
+            self._rate = rate
+            if rate == 0:
+                self._tokens = 0.0
+            else:
+                self._tokens = min(self._tokens, self._burst())
+
+    def consume(self, nbytes: int, should_stop: Optional[Callable[[], bool]] = None):
+        """
+        Charge `nbytes` to the bucket, sleeping until it is out of debt.
+        Returns early if `should_stop()` becomes true (e.g. the job was cancelled).
+        """
+        with self._lock:
+            if self._rate <= 0:
+                return
+            self._refill_locked()
+            self._tokens -= nbytes
+
+        while True:
+            with self._lock:
+                if self._rate <= 0:
+                    self._tokens = 0.0
+                    return
+                self._refill_locked()
+                if self._tokens >= 0:
+                    return
+                wait = -self._tokens / self._rate
+            if should_stop and should_stop():
+                return
+            time.sleep(min(wait, _MAX_SLEEP))
+
+
+def _parse_clock(value: str) -> dt_time:
+    try:
+        return datetime.strptime(value.strip(), "%H:%M").time()
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid time '{value}', expected HH:MM")
+
+
+def parse_schedule(raw: Optional[str]) -> List[Dict]:
+    """
+    Parse a rate schedule stored as JSON, e.g.
+        [{"start": "01:00", "end": "07:00", "limit_mb_per_sec": 0}]
+    Windows may wrap past midnight. A limit of 0 means full speed.
+    Raises ValueError on malformed input.
+    """
+    if not raw:
+        return []
+    try:
+        entries = json.loads(raw) if isinstance(raw, str) else raw
+    except ValueError:
+        raise ValueError("Schedule must be a JSON list")
+    if not isinstance(entries, list):
+        raise ValueError("Schedule must be a JSON list")
+
+    schedule = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError("Each schedule entry must be an object")
+        limit = entry.get("limit_mb_per_sec", 0)
+        if not isinstance(limit, (int, float)) or limit < 0:
+            raise ValueError("limit_mb_per_sec must be a number >= 0")
+        schedule.append({
+            "start": _parse_clock(entry.get("start")),
+            "end": _parse_clock(entry.get("end")),
+            "limit_mb_per_sec": float(limit),
+        })
+    return schedule
+
+
+def scheduled_limit(schedule: List[Dict], default: float, now: Optional[datetime] = None) -> float:
+    """MB/s limit in effect at `now` (first matching window wins, else `default`)."""
+    current = (now or datetime.now()).time()
+    for window in schedule:
+        start, end = window["start"], window["end"]
+        if start <= end:
+            active = start <= current < end
+        else:
+            # Wraps midnight, e.g. 22:00-06:00
+            active = current >= start or current < end
+        if active:
+            return window["limit_mb_per_sec"]
+    return default
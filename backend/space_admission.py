@@ -0,0 +1,176 @@
+"""
+Free-space admission control for the copy queue.
+
+Every queued or running job reserves the bytes it still has to write
+on its destination device. Jobs that will write much less than their
+source size reserve nothing up front: a sync only copies the files that
+changed, which the worker finds out when it starts, and a job that can
+reflink or hard link (same filesystem) writes almost no data. The worker's
+preflight sizes those. A new job is admitted only if its size fits in
+the destination's free space minus those reservations and a safety margin.
+Otherwise it is rejected or held, depending on `copy_space_policy`. Held jobs
+are re-admitted by the copy worker as reservations are released (jobs
+finish, fail or are cancelled) or space is freed.
+"""
+import os
+import shutil
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+import folder_index
+from fast_copy import DEFAULT_LINK_MODE, LINK_MODES
+from file_operations import format_size
+from models import CopyJob, MediaItem, SystemSettings
+from progress_registry import progress_registry
+
+HELD_STATUS = "held"
+RESERVING_STATUSES = ("queued", "processing")
+SPACE_POLICIES = ("hold", "reject", "off")
+DEFAULT_SPACE_POLICY = "hold"
+DEFAULT_MIN_FREE_SPACE_GB = 1.0  # Always leave this much free on the destination
+
+GB = 1024 * 1024 * 1024
+
+
+class InsufficientSpaceError(Exception):
+    """A job doesn't fit on its destination."""
+
+    def __init__(self, needed: int, available: int, destination: str):
+        self.needed = needed
+        self.available = available
+        super().__init__(
+            f"Not enough free space on {destination}: needs {format_size(needed)}, "
+            f"{format_size(max(available, 0))} available after queued jobs"
+        )
+
+
+def _existing_ancestor(path: str) -> Optional[str]:
+    current = path
+    while current:
+        if os.path.exists(current):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return None
+
+
+def device_of(path: str) -> Optional[int]:
+    """st_dev of a path, or of its nearest existing parent."""
+    existing = _existing_ancestor(path)
+    try:
+        return os.stat(existing).st_dev if existing else None
+    except OSError:
+        return None
+
+
+def free_space(path: str) -> Optional[int]:
+    """Free bytes on the filesystem that `path` (or its nearest existing parent) lives on."""
+    existing = _existing_ancestor(path)
+    try:
+        return shutil.disk_usage(existing).free if existing else None
+    except OSError:
+        return None
+
+
+def get_space_policy(db: Session) -> Tuple[str, int]:
+    """(policy, margin in bytes) from SystemSettings."""
+    policy_setting = db.query(SystemSettings).filter(SystemSettings.key == "copy_space_policy").first()
+    policy = policy_setting.value if policy_setting and policy_setting.value in SPACE_POLICIES else DEFAULT_SPACE_POLICY
+    margin_setting = db.query(SystemSettings).filter(SystemSettings.key == "copy_min_free_space_gb").first()
+    try:
+        margin_gb = float(margin_setting.value) if margin_setting and margin_setting.value else DEFAULT_MIN_FREE_SPACE_GB
+    except ValueError:
+        margin_gb = DEFAULT_MIN_FREE_SPACE_GB
+    return policy, int(margin_gb * GB)
+
+
+def link_methods(db: Session, source_path: str, destination_path: str) -> Tuple[str, ...]:
+    """Link methods a copy can use: none unless source and destination share a filesystem."""
+    setting = db.query(SystemSettings).filter(SystemSettings.key == "copy_link_mode").first()
+    mode = setting.value if setting and setting.value in LINK_MODES else DEFAULT_LINK_MODE
+    methods = LINK_MODES[mode]
+    if methods and device_of(source_path) != device_of(destination_path):
+        return ()
+    return methods
+
+
+def estimate_size(db: Session, source_path: str) -> int:
+    """
+    Bytes a copy of `source_path` will write: the scanner's size or the folder
+    size index if known, one stat for a file, else 0 (unknown). A folder is
+    never walked here; the worker sizes it from its manifest when the job
+    starts and its preflight holds or fails the job then.
+    """
+    item = db.query(MediaItem.size_bytes).filter(MediaItem.full_path == source_path).first()
+    if item and item.size_bytes:
+        return item.size_bytes
+    indexed = folder_index.indexed_size(db, source_path)
+    if indexed is not None:
+        return indexed
+    try:
+        return 0 if os.path.isdir(source_path) else os.path.getsize(source_path)
+    except OSError:
+        return 0
+
+
+def remaining_bytes(job: CopyJob) -> int:
+    """Bytes a job still has to write (live progress for running jobs)."""
+    copied = job.copied_size_bytes or 0
+    live = progress_registry.get(job.id) if job.status == "processing" else None
+    if live:
+        copied = live["copied_size_bytes"]
+    return max(0, (job.total_size_bytes or 0) - copied)
+
+
+def reservation(db: Session, job: CopyJob) -> int:
+    """
+    Bytes `job` holds against its destination's free space. Used both to
+    admit a job and to count it against later ones, so the two always agree.
+    """
+    if job.sync_mode and job.status != "processing":
+        return 0  # Changed files aren't known until the worker compares them
+    if link_methods(db, job.source_path, job.destination_path):
+        return 0
+    return remaining_bytes(job)
+
+
+def reserved_bytes(db: Session, device: Optional[int], exclude_job_id: Optional[int] = None) -> int:
+    """Sum of what queued and running jobs still have to write to `device`."""
+    jobs = db.query(CopyJob).filter(CopyJob.status.in_(RESERVING_STATUSES)).all()
+    total = 0
+    for job in jobs:
+        if job.id == exclude_job_id:
+            continue
+        if device_of(job.destination_path) == device:
+            total += reservation(db, job)
+    return total
+
+
+def available_for(db: Session, destination_path: str, margin: int, exclude_job_id: Optional[int] = None) -> Optional[int]:
+    """Free bytes on the destination minus reservations and margin (None if unknown)."""
+    free = free_space(destination_path)
+    if free is None:
+        return None
+    reserved = reserved_bytes(db, device_of(destination_path), exclude_job_id)
+    return free - reserved - margin
+
+
+def admit(db: Session, destination_path: str, size: int, exclude_job_id: Optional[int] = None) -> Tuple[str, Optional[str]]:
+    """
+    Decide how a new job of `size` bytes enters the queue.
+    Returns ("queued", None) or (HELD_STATUS, reason); raises InsufficientSpaceError
+    when the policy is "reject".
+    """
+    policy, margin = get_space_policy(db)
+    if policy == "off" or size <= 0:
+        return "queued", None
+    available = available_for(db, destination_path, margin, exclude_job_id)
+    if available is None or size <= available:
+        return "queued", None
+    error = InsufficientSpaceError(size, available, destination_path)
+    if policy == "reject":
+        raise error
+    return HELD_STATUS, f"Waiting for free space: {error}"
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from copy_manifest import CopyManifest  # noqa: E402
+
+
+def _write(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+
+
+def test_symlinked_subdirectory_is_copied(tmp_path):
+    show = tmp_path / "src" / "Show"
+    _write(str(show / "S01" / "e01.mkv"), 100)
+    _write(str(tmp_path / "elsewhere" / "S02" / "e01.mkv"), 250)
+    os.symlink(tmp_path / "elsewhere" / "S02", show / "S02")
+
+    manifest = CopyManifest.build(str(show), str(tmp_path / "dst" / "Show"))
+
+    assert sorted(f.rel_path for f in manifest.files) == [
+        os.path.join("S01", "e01.mkv"), os.path.join("S02", "e01.mkv")
+    ]
+    assert manifest.total_size == 350
+    assert str(tmp_path / "dst" / "Show" / "S02") in [dst for _, dst in manifest.dirs]
+
+
+def test_symlink_loop_is_walked_once(tmp_path):
+    show = tmp_path / "Show"
+    _write(str(show / "S01" / "e01.mkv"), 100)
+    os.symlink(show, show / "S01" / "back")
+
+    manifest = CopyManifest.build(str(show), str(tmp_path / "dst"))
+
+    assert [f.rel_path for f in manifest.files] == [os.path.join("S01", "e01.mkv")]
+    assert manifest.total_size == 100
+
+
+def test_unlistable_directory_fails_the_walk(tmp_path, monkeypatch):
+    show = tmp_path / "Show"
+    _write(str(show / "S01" / "e01.mkv"), 100)
+    real_scandir = os.scandir
+
+    def flaky_scandir(path):
+        if os.path.basename(path) == "S01":
+            raise OSError(5, "Input/output error")
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", flaky_scandir)
+    with pytest.raises(OSError):
+        CopyManifest.build(str(show), str(tmp_path / "dst"))
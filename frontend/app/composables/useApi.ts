@@ -147,6 +147,20 @@ export const useApi = () => {
     }
   }
 
+  const getCopySpeed = async (): Promise<{ speed_bps: number; speed_ewma_bps: number; series: [number, number][]; step_seconds: number; active_jobs: number }> => {
+    try {
+      return await $fetch(
+        `${config.public.apiBase}/api/copy/speed`,
+        {
+          headers: authHeaders,
+        }
+      )
+    } catch (error) {
+      console.error('Failed to get copy speed:', error)
+      throw error
+    }
+  }
+
   const getJob = async (jobId: number): Promise<CopyJob> => {
     try {
       return await $fetch<CopyJob>(
@@ -540,6 +554,7 @@ export const useApi = () => {
     getFolderInfo,
     startCopy,
     getQueue,
+    getCopySpeed,
     getJob,
     getHistory,
     cancelJob,
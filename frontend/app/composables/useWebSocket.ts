@@ -4,14 +4,17 @@ interface ProgressUpdate {
   progress_percent: number
   copied_size_bytes: number
   total_size_bytes: number
+  // Speed telemetry computed by the backend (present while a job is processing)
+  speed_bps?: number
+  speed_avg_bps?: number
+  speed_ewma_bps?: number
+  eta_seconds?: number | null
 }
 
 // --- Singleton State (Module Scope) ---
 const socket = ref<WebSocket | null>(null)
 const isConnected = ref(false)
 const progressUpdates = ref<Map<number, ProgressUpdate>>(new Map())
-// Stats now includes speedHistory for smoothing
-const jobStats = ref<Map<number, { lastBytes: number; lastTime: number; speed: number; speedHistory: number[] }>>(new Map())
 const subscriberCount = ref(0)
 let reconnectTimer: any = null
 
@@ -20,15 +23,16 @@ export const useWebSocket = () => {
 
   const getEstimatedTimeRemaining = (jobId: number): string | null => {
     const job = progressUpdates.value.get(jobId)
-    const stats = jobStats.value.get(jobId)
 
-    if (!job || !stats || stats.speed === 0) return null
-    if (job.status !== 'processing') return null
+    if (!job || job.status !== 'processing') return null
 
-    const remainingBytes = job.total_size_bytes - job.copied_size_bytes
-    if (remainingBytes <= 0) return null
+    // ETA comes from the server (smoothed speed), so every tab agrees
+    return formatEta(job.eta_seconds)
+  }
 
-    const seconds = remainingBytes / stats.speed
+  // Server ETA in seconds -> "45s", "12m", "1.5h" (null when unknown)
+  const formatEta = (seconds?: number | null): string | null => {
+    if (!seconds || seconds <= 0) return null
 
     if (seconds < 60) return `${Math.ceil(seconds)}s`
     if (seconds < 3600) return `${Math.ceil(seconds / 60)}m`
@@ -65,37 +69,6 @@ export const useWebSocket = () => {
     socket.value.onmessage = (event) => {
       try {
         const data: ProgressUpdate = JSON.parse(event.data)
-        const now = Date.now()
-
-        // Calculate Speed with Moving Average
-        const stats = jobStats.value.get(data.job_id)
-        if (stats) {
-          const timeDiff = (now - stats.lastTime) / 1000 // seconds
-          const bytesDiff = data.copied_size_bytes - stats.lastBytes
-
-          // Only update speed if enough time passed (avoid jitter)
-          if (timeDiff > 0.5) {
-            const currentSpeed = bytesDiff / timeDiff
-            const history = [...stats.speedHistory, currentSpeed].slice(-5) // Keep last 5 samples
-            const avgSpeed = history.reduce((a, b) => a + b, 0) / history.length
-
-            jobStats.value.set(data.job_id, {
-              lastBytes: data.copied_size_bytes,
-              lastTime: now,
-              speed: avgSpeed,
-              speedHistory: history
-            })
-          }
-        } else {
-          // Initialize
-          jobStats.value.set(data.job_id, {
-            lastBytes: data.copied_size_bytes,
-            lastTime: now,
-            speed: 0,
-            speedHistory: []
-          })
-        }
-
         progressUpdates.value.set(data.job_id, data)
       } catch (error) {
         console.error('[WebSocket] Parse error:', error)
@@ -137,6 +110,11 @@ export const useWebSocket = () => {
     return progressUpdates.value.get(jobId)
   }
 
+  // Smoothed (EWMA) speed in bytes/sec as reported by the server
+  const getJobSpeed = (jobId: number): number => {
+    return progressUpdates.value.get(jobId)?.speed_ewma_bps ?? 0
+  }
+
   // Component usage lifecycle
   onMounted(() => {
     subscriberCount.value++
@@ -161,6 +139,8 @@ export const useWebSocket = () => {
     connect,
     disconnect,
     getJobProgress,
-    getEstimatedTimeRemaining
+    getJobSpeed,
+    getEstimatedTimeRemaining,
+    formatEta
   }
 }